@@ -5,8 +5,10 @@ import asyncio
 from pathlib import Path
 import logging
 import threading
-from concurrent.futures import Future
-from typing import Dict, List, Optional, Any, Callable, Coroutine
+import queue
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Any, Callable, Coroutine, Tuple
 import aiotorrent
 import requests
 
@@ -37,6 +39,23 @@ class AppController:
         self.loop = asyncio.new_event_loop()
         self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
 
+        # Last VPN check; the check probes external IP services, so it is
+        # reused until it expires or invalidate_vpn_status() is called (the
+        # kill switch does so when it sees the VPN state or IP change)
+        self.vpn_status_ttl = 60.0
+        self._vpn_status: Optional[Dict] = None
+        self._vpn_checked_at = 0.0
+        self._vpn_lock = threading.Lock()
+
+        # Site/download state deltas pushed to the GUI (see publish_state)
+        self.state_queue: "queue.Queue[Dict]" = queue.Queue()
+        self.state_interval = 1.0
+        self._published_state: Dict[Tuple[str, str], Dict] = {}
+        self._state_task: Optional[asyncio.Task] = None
+        # Created on self.loop by the first refresh; on Python 3.9 a lock
+        # made here would bind to the main thread's loop instead
+        self._state_lock: Optional[asyncio.Lock] = None
+
     def initialize(self) -> bool:
         """
         Initialize all components.
@@ -65,13 +84,118 @@ class AppController:
             asyncio.create_task, self._sync_forum_periodically()
         )
 
-    def run_async_and_wait(self, coro: Coroutine) -> Any:
+    def run_async_and_wait(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
         """
         Run a coroutine on the controller's event loop from a synchronous context
         and wait for the result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait; on expiry the coroutine is cancelled and
+                concurrent.futures.TimeoutError is raised. None waits
+                indefinitely.
         """
         future: Future = asyncio.run_coroutine_threadsafe(coro, self.loop)
-        return future.result()
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            # Not the builtin TimeoutError before Python 3.11
+            future.cancel()
+            raise
+
+    # State updates
+
+    def start_state_updates(self):
+        """
+        Start pushing site/download state deltas onto state_queue.
+        Only started when there is a consumer (the GUI) to drain the queue.
+        """
+        def start():
+            if self._state_task is None:
+                self._state_task = asyncio.create_task(self._publish_state_periodically())
+
+        self.loop.call_soon_threadsafe(start)
+
+    def request_state_refresh(self):
+        """Publish state now instead of waiting for the next interval."""
+        self.loop.call_soon_threadsafe(asyncio.create_task, self._refresh_state())
+
+    async def _refresh_state(self):
+        """
+        Snapshot state in the default executor (it reads site metadata from
+        disk) and publish the deltas from the loop.
+        """
+        if self._state_lock is None:
+            self._state_lock = asyncio.Lock()
+        async with self._state_lock:
+            try:
+                state = await asyncio.get_running_loop().run_in_executor(None, self._snapshot_state)
+                self.publish_state(state)
+            except Exception as e:
+                logger.error("State update failed: %s", e)
+
+    async def _publish_state_periodically(self):
+        """Periodically publish state deltas."""
+        while True:
+            await self._refresh_state()
+            await asyncio.sleep(self.state_interval)
+
+    def _snapshot_state(self) -> Dict[Tuple[str, str], Dict]:
+        """Current state keyed by (kind, site_id)."""
+        snapshot = self.get_ui_snapshot()
+        state = {('site', site['site_id']): site for site in snapshot['sites']}
+        for download in snapshot['downloads']:
+            state[('download', download['site_id'])] = download
+        return state
+
+    def get_ui_snapshot(self) -> Dict[str, List[Dict]]:
+        """
+        Everything the GUI tables show, gathered in one pass.
+
+        Returns:
+            {'sites': [...], 'downloads': [...]}; each site entry is its status
+            merged with site_id and site_name, each download its status with site_id
+        """
+        sites = self.get_my_sites()
+        metadata = {site['site_id']: site for site in sites if site.get('site_id')}
+        statuses = self.get_status_map(list(metadata), metadata)
+        site_rows = []
+        for site in sites:
+            status = statuses.get(site['site_id'])
+            if status:
+                site_rows.append(dict(status, site_id=site['site_id'], site_name=site['site_name']))
+
+        return {'sites': site_rows, 'downloads': self.get_downloads()}
+
+    def collect_state_events(self, state: Optional[Dict[Tuple[str, str], Dict]] = None) -> List[Dict]:
+        """
+        Compare current state with what was last published.
+
+        Args:
+            state: Snapshot from _snapshot_state(); taken now if not given
+
+        Returns:
+            Events of the form {'kind': 'site'|'download', 'site_id': ..., 'status': {...}}
+            for new or changed entries, with 'status' None for removed entries.
+        """
+        if state is None:
+            state = self._snapshot_state()
+        events = []
+
+        for (kind, site_id), status in state.items():
+            if self._published_state.get((kind, site_id)) != status:
+                events.append({'kind': kind, 'site_id': site_id, 'status': status})
+
+        for (kind, site_id) in self._published_state.keys() - state.keys():
+            events.append({'kind': kind, 'site_id': site_id, 'status': None})
+
+        self._published_state = state
+        return events
+
+    def publish_state(self, state: Optional[Dict[Tuple[str, str], Dict]] = None):
+        """Push state deltas onto state_queue. Runs on the controller loop."""
+        for event in self.collect_state_events(state):
+            self.state_queue.put(event)
 
     async def _sync_forum_periodically(self):
         """Periodically syncs the forum data."""
@@ -95,11 +219,24 @@ class AppController:
                     self.downloader.remove_site(site_id)
             self._online = False
 
-        # Stop the event loop
-        self.loop.call_soon_threadsafe(self.loop.stop)
-        self.thread.join(timeout=2)
+        # Cancel pending tasks so nothing is left awaiting I/O, then stop the loop
+        if self.thread.is_alive():
+            try:
+                asyncio.run_coroutine_threadsafe(self._cancel_tasks(), self.loop).result(timeout=2)
+            except Exception as e:
+                logger.warning("Timed out cancelling event loop tasks: %s", e)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=2)
         logger.info("Application controller shutdown complete")
 
+    async def _cancel_tasks(self):
+        """Cancel all other tasks on the loop and wait for them to finish."""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
     # Site creation methods
     
     async def create_site(self, site_name: str, content_dir: Path,
@@ -151,10 +288,11 @@ class AppController:
         if self.downloader:
             self.downloader.remove_site(site_id, delete_files)
 
-    def delete_my_site(self, site_id: str, delete_key: bool = False):
+    async def delete_my_site(self, site_id: str, delete_key: bool = False) -> bool:
         """
         Delete one of my sites.
         This stops seeding and deletes all associated data.
+        File deletion is offloaded to a thread to avoid blocking.
         """
         logger.info(f"Deleting my site: {site_id}")
         # Stop seeding if active
@@ -163,7 +301,7 @@ class AppController:
 
         # Delete from storage
         try:
-            self.storage.delete_site(site_id, delete_key)
+            await asyncio.to_thread(self.storage.delete_site, site_id, delete_key)
             logger.info(f"Successfully deleted site data for: {site_id}")
             return True
         except Exception as e:
@@ -173,8 +311,22 @@ class AppController:
     # Status methods
     
     def get_vpn_status(self) -> Dict:
-        """Get current VPN status."""
-        return VPNChecker.check_vpn_status()
+        """Get current VPN status (cached for vpn_status_ttl seconds)."""
+        with self._vpn_lock:
+            if (self._vpn_status is not None
+                    and time.monotonic() - self._vpn_checked_at < self.vpn_status_ttl):
+                return self._vpn_status
+
+        status = VPNChecker.check_vpn_status()
+        with self._vpn_lock:
+            self._vpn_status = status
+            self._vpn_checked_at = time.monotonic()
+        return status
+
+    def invalidate_vpn_status(self):
+        """Force the next get_vpn_status() call to re-check, e.g. after a network change."""
+        with self._vpn_lock:
+            self._vpn_status = None
     
     def is_p2p_online(self) -> bool:
         """Check if P2P engine is online."""
@@ -189,15 +341,42 @@ class AppController:
         if not self.downloader:
             return []
         
-        downloads = []
-        for site_id in list(self.downloader.active_downloads.keys()):
-            status = self.downloader.get_site_status(site_id)
-            if status:
-                status['site_id'] = site_id
-                downloads.append(status)
-        
-        return downloads
+        statuses = self.get_status_map(list(self.downloader.active_downloads.keys()))
+        return [dict(status, site_id=site_id) for site_id, status in statuses.items()]
     
+    def get_status_map(self, site_ids: List[str],
+                       metadata: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """
+        Get status for several sites in one call.
+
+        Args:
+            site_ids: Sites to look up
+            metadata: Already-loaded site metadata by site_id, used for sites
+                that aren't seeding or downloading instead of re-reading it
+
+        Returns:
+            Dict mapping site_id to status; sites without a status are omitted
+        """
+        metadata = metadata or {}
+        seeding = set(self.publisher.active_sites) if self.publisher else set()
+        downloading = set(self.downloader.active_downloads) if self.downloader else set()
+
+        statuses = {}
+        for site_id in site_ids:
+            if site_id in seeding:
+                status = self.publisher.get_site_status(site_id)
+            elif site_id in downloading:
+                status = self.downloader.get_site_status(site_id)
+            elif site_id in metadata:
+                # Same fallback as SitePublisher.get_site_status
+                status = {"state": metadata[site_id].get('status', 'Unknown')}
+            else:
+                status = self.get_site_status(site_id)
+            if status:
+                statuses[site_id] = status
+
+        return statuses
+
     def get_site_status(self, site_id: str) -> Optional[Dict]:
         """Get status for a specific site."""
         if self.publisher:
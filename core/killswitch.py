@@ -3,7 +3,6 @@ VPN Kill Switch - Emergency network shutdown.
 Monitors VPN status and kills all network activity if VPN drops.
 """
 import threading
-import time
 import logging
 from typing import Callable, Optional
 from .vpn_check import VPNChecker
@@ -29,16 +28,22 @@ class KillSwitch:
         self.last_known_ip = None
         self.monitor_thread: Optional[threading.Thread] = None
         self.on_emergency_shutdown: Optional[Callable] = None
+        self.on_status_change: Optional[Callable] = None
         self._shutdown_triggered = False
+        # Set by stop() to cut the wait between checks short
+        self._wake = threading.Event()
         
-    def start(self, on_emergency_shutdown: Callable):
+    def start(self, on_emergency_shutdown: Callable, on_status_change: Optional[Callable] = None):
         """
         Start VPN monitoring.
         
         Args:
             on_emergency_shutdown: Callback to execute on VPN loss
+            on_status_change: Callback to execute when the VPN state or
+                public IP changes, e.g. to drop a cached status
         """
         self.on_emergency_shutdown = on_emergency_shutdown
+        self.on_status_change = on_status_change
         self.is_running = True
         
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
@@ -48,6 +53,7 @@ class KillSwitch:
     def stop(self):
         """Stop monitoring."""
         self.is_running = False
+        self._wake.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
         logger.info("Kill switch monitoring stopped")
@@ -56,7 +62,10 @@ class KillSwitch:
         """Main monitoring loop."""
         while self.is_running:
             self._check_vpn_status()
-            time.sleep(self.check_interval)
+            self._wake.wait(self.check_interval)
+            # Cleared only after waking, so a stop() during the check or
+            # the wait is always seen by the is_running test above
+            self._wake.clear()
     
     def _check_vpn_status(self):
         """Check VPN status and trigger kill switch if needed."""
@@ -75,6 +84,12 @@ class KillSwitch:
                     self.audit_logger.log_vpn_status_change(
                         was_safe, self.is_safe, current_ip or 'UNKNOWN'
                     )
+                
+                if self.on_status_change:
+                    try:
+                        self.on_status_change()
+                    except Exception as e:
+                        logger.error("Error in VPN status change callback: %s", e)
             
             # Trigger kill switch if VPN appears down
             if not self.is_safe and not self._shutdown_triggered:
@@ -3,10 +3,12 @@ Enhanced security module with comprehensive protections.
 """
 import os
 import re
+import stat
 import hashlib
 import secrets
 from pathlib import Path
 from typing import Optional, Tuple
+from urllib.parse import unquote
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -20,6 +22,15 @@ class SecurityManager:
     
     # Strict filename validation
     SAFE_FILENAME_PATTERN = re.compile(r'^[a-zA-Z0-9_\-\.]+$')
+
+    # Site IDs are SHA256 hex digests
+    SITE_ID_PATTERN = re.compile(r'[0-9a-fA-F]{64}')
+
+    # Anything that can't appear in a raw request path before decoding
+    UNSAFE_PATH_CHAR_PATTERN = re.compile(r'[^a-zA-Z0-9_\-\.%/\\]')
+
+    # Windows drive-absolute paths (C:\...)
+    DRIVE_PATH_PATTERN = re.compile(r'^[a-zA-Z]:\\')
     
     # Allowed MIME types
     ALLOWED_EXTENSIONS = {
@@ -87,14 +98,18 @@ class SecurityManager:
         Defense in depth:
         1. Path normalization
         2. Component validation
-        3. Resolution check
-        4. Extension whitelist
+        3. Symlink rejection (before resolving)
+        4. Resolution check
+        5. Extension whitelist
+
+        Rejections are logged at debug level only; callers facing untrusted
+        input decide how loudly (and how often) to report them.
         """
         if not base_dir.is_absolute():
             raise ValueError("base_dir must be absolute")
 
         # Block absolute paths (Unix and Windows)
-        if user_path.startswith('/') or user_path.startswith('\\') or re.match(r'^[a-zA-Z]:\\', user_path):
+        if user_path.startswith(('/', '\\')) or SecurityManager.DRIVE_PATH_PATTERN.match(user_path):
             return None
         
         # Normalize and strip
@@ -103,28 +118,43 @@ class SecurityManager:
         if not user_path:
             return None
         
-        # Check for null bytes
-        if '\x00' in user_path:
-            logger.warning("Null byte in path: %s", repr(user_path))
+        # Fast reject: once decoded, a component may only hold
+        # SAFE_FILENAME_PATTERN characters, so anything that isn't one of
+        # those, a separator or a %-escape (null bytes, unicode slashes,
+        # spaces, ...) is refused before decoding or splitting
+        if SecurityManager.UNSAFE_PATH_CHAR_PATTERN.search(user_path):
+            logger.debug("Unsafe character in path: %s", repr(user_path))
             return None
         
-        # URL decode (prevent encoding attacks)
-        try:
-            from urllib.parse import unquote
-            user_path = unquote(user_path)
-        except:
-            pass
+        # URL decode (prevent encoding attacks). unquote returns the string
+        # untouched when there is no '%', and never raises on str input
+        # (bad UTF-8 becomes U+FFFD, which the component check rejects)
+        user_path = unquote(user_path)
         
         # Split and validate each component
         parts = user_path.replace('\\', '/').split('/')
         for part in parts:
             if part in ('', '.', '..'):
-                logger.warning("Invalid path component: %s", part)
+                logger.debug("Invalid path component: %s", part)
                 return None
             if not SecurityManager.SAFE_FILENAME_PATTERN.match(part):
-                logger.warning("Unsafe filename pattern: %s", part)
+                logger.debug("Unsafe filename pattern: %s", part)
                 return None
         
+        # Refuse symlinks anywhere below base_dir before resolving: lstat
+        # each component so a hostile link is never followed. Components
+        # past the first missing one can't be links.
+        current = base_dir
+        for part in parts:
+            current = current / part
+            try:
+                mode = os.lstat(current).st_mode
+            except OSError:
+                break
+            if stat.S_ISLNK(mode):
+                logger.debug("Symlink in path: %s", user_path)
+                return None
+
         # Reconstruct path
         requested_path = base_dir / Path(*parts)
         
@@ -132,19 +162,19 @@ class SecurityManager:
         try:
             resolved = requested_path.resolve(strict=False)
         except (OSError, RuntimeError) as e:
-            logger.warning("Path resolution failed: %s", e)
+            logger.debug("Path resolution failed: %s", e)
             return None
         
         # CRITICAL: Ensure within base_dir
         try:
             resolved.relative_to(base_dir.resolve())
         except ValueError:
-            logger.warning("Path escape attempt: %s -> %s", user_path, resolved)
+            logger.debug("Path escape attempt: %s -> %s", user_path, resolved)
             return None
         
         # Validate extension
         if resolved.suffix.lower() not in SecurityManager.ALLOWED_EXTENSIONS:
-            logger.warning("Blocked extension: %s", resolved.suffix)
+            logger.debug("Blocked extension: %s", resolved.suffix)
             return None
         
         return resolved
@@ -154,13 +184,8 @@ class SecurityManager:
         """Validate site ID format (64 hex chars)."""
         if not isinstance(site_id, str):
             return False
-        if len(site_id) != 64:
-            return False
-        try:
-            int(site_id, 16)
-            return True
-        except ValueError:
-            return False
+        # fullmatch, unlike int(site_id, 16), rejects '0x', '_' and whitespace
+        return SecurityManager.SITE_ID_PATTERN.fullmatch(site_id) is not None
     
     @staticmethod
     def secure_delete(filepath: Path, passes: int = 3):
@@ -2,19 +2,104 @@
 Secure file storage and key management.
 """
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+import itertools
 import json
 import logging
+import os
+import tempfile
 from .security import SecurityManager
 
+try:
+    import orjson
+except ImportError:  # optional, faster JSON
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize obj as 2-space indented UTF-8 JSON, with orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # orjson is stricter (e.g. non-str keys); let json decide
+            pass
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def loads_json(data: bytes) -> Any:
+    """Parse JSON bytes, with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: "os.PathLike | str") -> Any:
+    """Read and parse a JSON file."""
+    with open(path, 'rb') as f:
+        return loads_json(f.read())
+
+
+def atomic_write_json(path: Path, obj: Any):
+    """
+    Write obj as JSON to path atomically.
+
+    The data goes to a temporary file in the same directory, which then
+    replaces path, so readers see either the old or the new contents.
+    """
+    _atomic_write_bytes(path, dumps_json(obj))
+
+
+def write_json_if_changed(path: Path, obj: Any) -> bool:
+    """
+    Atomically write obj as JSON to path unless the file already holds
+    exactly that JSON.
+
+    Returns:
+        True if the file was written
+    """
+    data = dumps_json(obj)
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    _atomic_write_bytes(path, data)
+    return True
+
+
+def _atomic_write_bytes(path: Path, data: bytes):
+    """Write data to a temp file beside path, fsync it, and rename it over path."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
 class SiteStorage:
     """
     Manages secure storage of sites, keys, and metadata.
+
+    version changes on every metadata write or site deletion, so callers
+    can key caches of per-site lookups on it. Versions are drawn from one
+    counter shared by all instances and never repeat.
     """
+
+    _versions = itertools.count()
     
     def __init__(self, data_dir: Path):
+        self.version = next(self._versions)
         self.data_dir = data_dir
         self.keys_dir = data_dir / 'keys'
         self.content_dir = data_dir / 'sites'
@@ -88,8 +173,8 @@ class SiteStorage:
         """Save site metadata."""
         metadata_file = self.metadata_dir / f"{site_id}.json"
         
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        atomic_write_json(metadata_file, metadata)
+        self.version = next(self._versions)
         
         logger.info("Saved metadata for site: %s", site_id)
     
@@ -97,12 +182,10 @@ class SiteStorage:
         """Load site metadata."""
         metadata_file = self.metadata_dir / f"{site_id}.json"
         
-        if not metadata_file.exists():
-            return None
-        
         try:
-            with open(metadata_file, 'r') as f:
-                return json.load(f)
+            return read_json(metadata_file)
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.error("Failed to load metadata for %s: %s", site_id, e)
             return None
@@ -115,13 +198,16 @@ class SiteStorage:
         """List all tracked sites."""
         sites = []
         
-        for metadata_file in self.metadata_dir.glob('*.json'):
-            try:
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                    sites.append(metadata)
-            except Exception as e:
-                logger.error("Failed to load %s: %s", metadata_file, e)
+        # scandir entries carry the file type from the directory read, so
+        # nothing is stat'ed except the files that are then opened
+        with os.scandir(self.metadata_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json') or not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    sites.append(read_json(entry.path))
+                except Exception as e:
+                    logger.error("Failed to load %s: %s", entry.path, e)
         
         return sites
     
@@ -138,6 +224,7 @@ class SiteStorage:
         if metadata_file.exists():
             metadata_file.unlink()
             logger.info("Deleted metadata: %s", site_id)
+        self.version = next(self._versions)
         
         # Delete content
         content_dir = self.get_site_content_dir(site_id)
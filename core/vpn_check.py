@@ -1,6 +1,7 @@
 """
 Optional VPN detection (NOT ENFORCEABLE - UI WARNING ONLY).
 """
+import ipaddress
 import socket
 import requests
 from typing import Optional
@@ -40,19 +41,10 @@ class VPNChecker:
     
     @staticmethod
     def is_private_ip(ip: str) -> bool:
-        """Check if IP is in private ranges."""
+        """Check if IP is in private ranges (including loopback), IPv4 or IPv6."""
         try:
-            parts = [int(p) for p in ip.split('.')]
-            if parts[0] == 10:
-                return True
-            if parts[0] == 172 and 16 <= parts[1] <= 31:
-                return True
-            if parts[0] == 192 and parts[1] == 168:
-                return True
-            if parts[0] == 127:
-                return True
-            return False
-        except:
+            return ipaddress.ip_address(ip).is_private
+        except ValueError:
             return True  # Assume private on parse failure
     
     @classmethod
@@ -7,46 +7,163 @@ from tkinter import ttk, messagebox, filedialog, scrolledtext
 from pathlib import Path
 import threading
 import logging
+import functools
+import webbrowser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 from typing import Optional, Callable
-from queue import Queue
+from queue import Empty
 from .log_handler import QueueHandler
 from .theme import Theme
+from .virtual_table import VirtualTable
 
 logger = logging.getLogger(__name__)
 
+# Format of lines in the log viewer
+LOG_FORMAT = '{asctime} {levelname} {name}: {message}'
+
+# Maximum number of lines kept in the log viewer; trimming waits until the
+# viewer is LOG_TRIM_SLACK lines over the cap so deletes are amortised
+LOG_MAX_LINES = 5000
+LOG_TRIM_SLACK = 500
+
+# Log lines buffered between drains (oldest dropped beyond this), and the
+# most moved into the viewer per drain
+LOG_BUFFER_SIZE = 2000
+LOG_BATCH_MAX = 200
+
+# Levels offered by the Logs tab filter
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+
+# GUI asyncio loop step interval while controller calls are in flight / idle
+PUMP_BUSY_MS = 5
+PUMP_IDLE_MS = 50
+
+# Bounds for the adaptive log/state queue polling intervals
+POLL_MIN_MS = 10
+POLL_MAX_MS = 500
+
+# Treeview column tables: (heading, width); the first column stretches
+SITES_COLUMNS = (
+    ('Name', 200),
+    ('Site ID', 250),
+    ('Status', 100),
+    ('Peers', 80),
+    ('Upload', 120),
+)
+DOWNLOADS_COLUMNS = (
+    ('Site ID', 250),
+    ('Progress', 100),
+    ('Status', 100),
+    ('Down', 120),
+    ('Up', 120),
+    ('Peers', 80),
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _short_id(site_id: str) -> str:
+    """Truncated site ID for table display."""
+    return site_id[:16] + '...'
+
+
+@functools.lru_cache(maxsize=1024)
+def _fmt_tenths(value: float, unit: str) -> str:
+    """Format an already-rounded value; repeated values reuse the same string."""
+    return f"{value:.1f}{unit}"
+
+
+def _fmt_rate(value: float) -> str:
+    """Transfer rate for table display, e.g. '12.3 KB/s'."""
+    return _fmt_tenths(round(value, 1), ' KB/s')
+
+
+def _fmt_percent(value: float) -> str:
+    """Progress for table display, e.g. '45.6%'."""
+    return _fmt_tenths(round(value, 1), '%')
+
+
 class ZedNetGUI:
     """Main GUI application."""
 
-    def __init__(self, app_controller):
+    def __init__(self, app_controller, batch_interval_ms: int = 200):
         """
         Args:
             app_controller: Main application controller
+            batch_interval_ms: Window over which table updates are coalesced
         """
         self.controller = app_controller
+        self.batch_interval_ms = batch_interval_ms
         self.root = tk.Tk()
         self.root.title("ZedNet - Decentralized Web")
         self.root.geometry("1000x650")
         
         # Style
         self.style = ttk.Style()
-        self._set_theme('light')
-        
+        self._apply_ttk_theme('light')
+
+        # Set up logging: records are formatted into a ring buffer by the
+        # logging thread; the Tk thread only moves lines into the viewer
+        self.log_queue = deque(maxlen=LOG_BUFFER_SIZE)
+        self.queue_handler = QueueHandler(self.log_queue, level=logging.INFO)
+        self.queue_handler.setFormatter(logging.Formatter(LOG_FORMAT, style='{'))
+        logging.getLogger().addHandler(self.queue_handler)
+        self._log_dropped_seen = 0
+        self._log_poll_ms = 20
+
         # Create UI
         self._create_menu()
         self._create_main_content()
         self._create_status_bar()
 
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
+        self.root.bind('<Map>', self._on_map)
 
-        # Set up logging
-        self.log_queue = Queue()
-        queue_handler = QueueHandler(self.log_queue)
-        logging.getLogger().addHandler(queue_handler)
+        # VPN status is fetched off the Tk thread; at most one check in flight
+        self._vpn_status = None
+        self._vpn_check_pending = False
 
-        # Start update loops
-        self._process_log_queue()
-        self._update_ui()
+        # Status bar changes staged during a tick, applied in one idle callback
+        self._pending_status = {}
+        self._status_after_id = None
+
+        # Latest pushed status per kind and site_id, applied once per batch
+        # window; updates for a hidden tab wait until it is selected
+        self._pending_rows = {'site': {}, 'download': {}}
+        self._apply_scheduled = False
+
+        # Accumulated mouse-wheel deltas per tree, applied at most every 16 ms
+        self._pending_scroll = {}
+        self._scroll_scheduled = False
+
+        # Dialogs are built on first use and then hidden/re-shown
+        self._dialogs = {}
+        self._password_future: Optional[asyncio.Future] = None
+
+        self._state_poll_ms = 20
+
+        # Shared pool for blocking work started from the GUI
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='zednet-gui')
+
+        # Results of worker threads waiting to run on the Tk thread
+        self._completions = deque()
+        self._completion_lock = threading.Lock()
+
+        # Resolve the default browser off the UI thread so the first open is fast
+        self._browser = None
+        self._executor.submit(self._warm_browser)
+
+        # GUI-side asyncio loop, pumped from the Tk main loop. Controller work
+        # still runs on the controller's own loop thread (see _on_controller).
+        self.loop = asyncio.new_event_loop()
+        self._inflight = 0
+        self._pump_loop()
+
+        # Start update loops; table rows are pushed by the controller
+        self.controller.start_state_updates()
+        self._drain_state_queue()
+        self._update_status_bar()
     
     def _create_menu(self):
         """Create menu bar."""
@@ -74,31 +191,94 @@ class ZedNetGUI:
         help_menu.add_command(label="Terms of Service", command=self._show_terms)
 
     def _set_theme(self, mode: str):
-        """Set the application theme."""
+        """Switch the application theme (View menu)."""
+        self._apply_ttk_theme(mode)
+        self._apply_log_colors(mode)
+
+    def _apply_ttk_theme(self, mode: str):
+        """Rebuild the ttk styles for mode."""
         self.current_theme = mode
         Theme.apply_theme(self.style, mode)
 
-        # Update specific widget colors that don't auto-update
-        log_bg = Theme.DARK_SURFACE if mode == 'dark' else Theme.LIGHT_SURFACE
-        log_fg = Theme.DARK_TEXT if mode == 'dark' else Theme.LIGHT_TEXT
-        if hasattr(self, 'log_text'):
-            self.log_text.config(background=log_bg, foreground=log_fg)
+    def _apply_log_colors(self, mode: str):
+        """Color the log viewer, which is a plain Tk widget and ignores ttk styles."""
+        dark = mode == 'dark'
+        self.log_text.config(
+            background=Theme.DARK_SURFACE if dark else Theme.LIGHT_SURFACE,
+            foreground=Theme.DARK_TEXT if dark else Theme.LIGHT_TEXT
+        )
+        self.log_text.tag_configure('DEBUG', foreground=Theme.DARK_TEXT_SECONDARY if dark else Theme.LIGHT_TEXT_SECONDARY)
+        self.log_text.tag_configure('WARNING', foreground=Theme.DARK_WARNING if dark else Theme.LIGHT_WARNING)
+        self.log_text.tag_configure('ERROR', foreground=Theme.DARK_ERROR if dark else Theme.LIGHT_ERROR)
+        self.log_text.tag_configure('CRITICAL', foreground=Theme.DARK_ERROR if dark else Theme.LIGHT_ERROR,
+                                    font=('Courier', 9, 'bold'))
 
     def _create_status_bar(self):
         """Create status bar."""
         self.status_frame = ttk.Frame(self.root)
         self.status_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=2)
         
-        self.status_label_left = ttk.Label(self.status_frame, text="Welcome to ZedNet", style="Status.TLabel")
+        self.status_left_var = tk.StringVar(value="Welcome to ZedNet")
+        self.status_label_left = ttk.Label(self.status_frame, textvariable=self.status_left_var, style="Status.TLabel")
         self.status_label_left.pack(side=tk.LEFT, padx=5)
 
-        self.status_label_right = ttk.Label(self.status_frame, text="Server: http://127.0.0.1:9999", style="Status.TLabel")
+        self.status_right_var = tk.StringVar(value="Server: http://127.0.0.1:9999")
+        self.status_label_right = ttk.Label(self.status_frame, textvariable=self.status_right_var, style="Status.TLabel")
         self.status_label_right.pack(side=tk.RIGHT, padx=5)
 
+        # label -> (variable, last text, last foreground); compared in Python
+        # so unchanged values cost no Tcl calls
+        self._status_shown = {
+            self.status_label_left: [self.status_left_var, self.status_left_var.get(), ""],
+            self.status_label_right: [self.status_right_var, self.status_right_var.get(), ""],
+        }
+
     def _show_status_message(self, message: str, duration_ms: int = 4000):
         """Display a temporary message in the status bar."""
-        self.status_label_left.config(text=message)
-        self.root.after(duration_ms, lambda: self.status_label_left.config(text=""))
+        self._stage(self.status_label_left, message)
+        # A newer message restarts the timer instead of stacking another one
+        if self._status_after_id is not None:
+            self.root.after_cancel(self._status_after_id)
+        self._status_after_id = self.root.after(duration_ms, self._clear_status)
+
+    def _clear_status(self):
+        """Clear the temporary status message."""
+        self._status_after_id = None
+        self._stage(self.status_label_left, "")
+
+    def _stage(self, label: ttk.Label, text: str, foreground: Optional[str] = None):
+        """Stage a status label change; all staged changes are applied together when idle."""
+        if not self._pending_status:
+            self.root.after_idle(self._flush_status)
+        self._pending_status[label] = (text, foreground)
+
+    def _flush_status(self):
+        """Apply staged status label changes in a single pass."""
+        for label, (text, foreground) in self._pending_status.items():
+            shown = self._status_shown[label]
+            if shown[1] != text:
+                shown[0].set(text)
+                shown[1] = text
+            if foreground is not None and shown[2] != foreground:
+                label.configure(foreground=foreground)
+                shown[2] = foreground
+        self._pending_status.clear()
+
+    def _toast(self, message: str, ms: int = 2000):
+        """Show a self-dismissing notification near the top-right corner of the window."""
+        toast = tk.Toplevel(self.root)
+        toast.overrideredirect(True)
+        toast.attributes('-topmost', True)
+        if self.current_theme == 'dark':
+            bg, fg = Theme.DARK_SURFACE, Theme.DARK_TEXT
+        else:
+            bg, fg = Theme.LIGHT_TEXT, Theme.LIGHT_SURFACE
+        tk.Label(toast, text=message, bg=bg, fg=fg, padx=10, pady=5, justify=tk.LEFT).pack()
+        toast.update_idletasks()
+        x = self.root.winfo_x() + self.root.winfo_width() - toast.winfo_reqwidth() - 20
+        y = self.root.winfo_y() + 50
+        toast.geometry(f'+{x}+{y}')
+        toast.after(ms, toast.destroy)
 
     def _create_main_content(self):
         """Create main content area."""
@@ -120,56 +300,91 @@ class ZedNetGUI:
         self.log_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.log_frame, text="Logs")
         self._create_log_tab()
+
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
     
+    def _on_tab_changed(self, event=None):
+        """Bring the newly selected tab up to date."""
+        if self.notebook.select() == str(self.log_frame):
+            self._flush_log_buffer(LOG_BUFFER_SIZE)
+        else:
+            self._apply_pending()
+
     def _create_sites_tab(self):
         """Create my sites tab."""
         # Sites list
-        columns = ('Name', 'Site ID', 'Status', 'Peers', 'Upload')
+        self._sites_columns = tuple(name for name, _ in SITES_COLUMNS)
         self.sites_tree = ttk.Treeview(
             self.sites_frame,
-            columns=columns,
+            columns=self._sites_columns,
             show='headings'
         )
-        
-        for col in columns:
-            self.sites_tree.heading(col, text=col)
-        
-        self.sites_tree.column('Name', width=200)
-        self.sites_tree.column('Site ID', width=250)
-        self.sites_tree.column('Status', width=100)
-        self.sites_tree.column('Peers', width=80)
-        self.sites_tree.column('Upload', width=120)
+        self._configure_columns(self.sites_tree, SITES_COLUMNS)
 
-        self.sites_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
         # Scrollbar
         scrollbar = ttk.Scrollbar(
             self.sites_frame,
-            orient=tk.VERTICAL,
-            command=self.sites_tree.yview
+            orient=tk.VERTICAL
         )
-        self.sites_tree.configure(yscrollcommand=scrollbar.set)
-        # Place scrollbar inside the frame but pack it to the right
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.sites_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
+        # Only the visible rows are kept in the tree; the table drives the scrollbar
+        self.sites_table = VirtualTable(self.sites_tree, scrollbar, self._row_height())
 
-        # Right-click menu
-        self.sites_menu = tk.Menu(self.sites_tree, tearoff=0)
-        self.sites_menu.add_command(label="Publish Site", command=self._publish_site)
-        self.sites_menu.add_command(label="Stop Seeding", command=self._stop_seeding)
-        self.sites_menu.add_separator()
-        self.sites_menu.add_command(label="Copy Site ID", command=self._copy_site_id)
-        self.sites_menu.add_separator()
-        self.sites_menu.add_command(label="Remove Site...", command=self._remove_site)
+        # Fixed grid layout; row inserts must not trigger a frame re-layout
+        self.sites_frame.rowconfigure(0, weight=1)
+        self.sites_frame.columnconfigure(0, weight=1)
+        self.sites_frame.grid_propagate(False)
+        self.sites_tree.grid(row=0, column=0, sticky='nsew', padx=(5, 0), pady=5)
+        scrollbar.grid(row=0, column=1, sticky='ns', pady=5)
 
+        # Right-click menu, built on first use
+        self.sites_menu = None
         self.sites_tree.bind("<Button-3>", self._show_sites_menu)
+        self._bind_wheel(self.sites_table)
     
+    @staticmethod
+    def _configure_columns(tree: ttk.Treeview, columns):
+        """Apply a column table once: heading, width and stretch per column."""
+        for index, (name, width) in enumerate(columns):
+            tree.heading(name, text=name, anchor='w')
+            tree.column(name, width=width, stretch=(index == 0))
+
+    def _row_height(self) -> int:
+        """Treeview row height from the current style."""
+        try:
+            return int(self.style.lookup('Treeview', 'rowheight') or 25)
+        except (ValueError, tk.TclError):
+            return 25
+
+    def _bind_wheel(self, table: VirtualTable):
+        """Route mouse-wheel scrolling on a table through the rate-limited handler."""
+        tree = table.tree
+        tree.bind('<MouseWheel>', lambda e: self._on_wheel(table, e.delta))
+        # X11 reports wheel motion as buttons 4/5
+        tree.bind('<Button-4>', lambda e: self._on_wheel(table, 120))
+        tree.bind('<Button-5>', lambda e: self._on_wheel(table, -120))
+
+    def _on_wheel(self, table: VirtualTable, delta: int):
+        """Accumulate wheel motion and apply it once per frame."""
+        self._pending_scroll[table] = self._pending_scroll.get(table, 0) + delta
+        if not self._scroll_scheduled:
+            self._scroll_scheduled = True
+            self.root.after(16, self._flush_scroll)
+        return "break"
+
+    def _flush_scroll(self):
+        """Apply accumulated wheel motion to each table."""
+        for table, delta in self._pending_scroll.items():
+            # macOS reports small deltas; never round a real scroll down to zero
+            units = -int(delta / 120) or (-1 if delta > 0 else 1 if delta < 0 else 0)
+            if units:
+                table.scroll(units)
+        self._pending_scroll.clear()
+        self._scroll_scheduled = False
+
     def _create_downloads_tab(self):
         """Create downloads tab."""
         # Toolbar
         toolbar = ttk.Frame(self.downloads_frame)
-        toolbar.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
         
         ttk.Label(toolbar, text="Site ID:").pack(side=tk.LEFT, padx=(0, 5))
         
@@ -183,54 +398,97 @@ class ZedNetGUI:
         ).pack(side=tk.LEFT, padx=5)
         
         # Downloads list
-        columns = ('Site ID', 'Progress', 'Status', 'Down', 'Up', 'Peers')
+        self._downloads_columns = tuple(name for name, _ in DOWNLOADS_COLUMNS)
         self.downloads_tree = ttk.Treeview(
             self.downloads_frame,
-            columns=columns,
+            columns=self._downloads_columns,
             show='headings'
         )
-        
-        for col in columns:
-            self.downloads_tree.heading(col, text=col)
-
-        self.downloads_tree.column('Site ID', width=250)
-        self.downloads_tree.column('Progress', width=100)
-        self.downloads_tree.column('Status', width=100)
-        self.downloads_tree.column('Down', width=120)
-        self.downloads_tree.column('Up', width=120)
-        self.downloads_tree.column('Peers', width=80)
-        
-        self.downloads_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
+        self._configure_columns(self.downloads_tree, DOWNLOADS_COLUMNS)
+
         # Scrollbar
         scrollbar = ttk.Scrollbar(
             self.downloads_frame,
-            orient=tk.VERTICAL,
-            command=self.downloads_tree.yview
+            orient=tk.VERTICAL
         )
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.downloads_tree.configure(yscrollcommand=scrollbar.set)
+        # Only the visible rows are kept in the tree; the table drives the scrollbar
+        self.downloads_table = VirtualTable(self.downloads_tree, scrollbar, self._row_height())
+
+        # Fixed grid layout; row inserts must not trigger a frame re-layout
+        self.downloads_frame.rowconfigure(1, weight=1)
+        self.downloads_frame.columnconfigure(0, weight=1)
+        self.downloads_frame.grid_propagate(False)
+        toolbar.grid(row=0, column=0, columnspan=2, sticky='ew', padx=5, pady=5)
+        self.downloads_tree.grid(row=1, column=0, sticky='nsew', padx=(5, 0), pady=(0, 5))
+        scrollbar.grid(row=1, column=1, sticky='ns', pady=(0, 5))
+        self._bind_wheel(self.downloads_table)
     
     def _create_log_tab(self):
         """Create log viewer tab."""
+        toolbar = ttk.Frame(self.log_frame)
+        toolbar.pack(side=tk.TOP, fill=tk.X, padx=5, pady=(5, 0))
+        ttk.Label(toolbar, text="Log level:").pack(side=tk.LEFT, padx=(0, 5))
+        self.log_level_var = tk.StringVar(value=logging.getLevelName(self.queue_handler.level))
+        level_box = ttk.Combobox(
+            toolbar,
+            textvariable=self.log_level_var,
+            values=LOG_LEVELS,
+            state='readonly',
+            width=10
+        )
+        level_box.pack(side=tk.LEFT)
+        level_box.bind('<<ComboboxSelected>>', self._on_log_level_changed)
+
         self.log_text = scrolledtext.ScrolledText(
             self.log_frame,
             wrap=tk.WORD,
-            font=('Courier', 9)
+            font=('Courier', 9),
+            undo=False,
+            autoseparators=False,
+            maxundo=0
         )
+        self._log_line_count = 0
+        # Read-only; only re-enabled while a batch of log lines is appended
+        self.log_text.configure(state='disabled')
         self.log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        self._set_theme(self.current_theme) # Apply theme to log viewer
+        self._apply_log_colors(self.current_theme)
+
+    def _on_log_level_changed(self, event=None):
+        """Only records at or above the chosen level are queued for the viewer."""
+        self.queue_handler.setLevel(self.log_level_var.get())
     
     def _create_site_dialog(self):
         """Show create site dialog."""
-        dialog = tk.Toplevel(self.root)
+        self._show_dialog('create', self._build_create_dialog)
+        for entry in (self.create_name_entry, self.create_path_entry, self.create_password_entry):
+            entry.delete(0, tk.END)
+
+    def _show_dialog(self, name: str, build: Callable[[tk.Toplevel], None]) -> tk.Toplevel:
+        """
+        Show a cached dialog, building it with build(dialog) on first use.
+        Closing the window withdraws it so it can be shown again.
+        """
+        dialog = self._dialogs.get(name)
+        if dialog is None:
+            dialog = tk.Toplevel(self.root)
+            dialog.withdraw()
+            dialog.protocol("WM_DELETE_WINDOW", dialog.withdraw)
+            build(dialog)
+            self._dialogs[name] = dialog
+
+        dialog.deiconify()
+        dialog.lift()
+        return dialog
+
+    def _build_create_dialog(self, dialog: tk.Toplevel):
+        """Build the create site dialog widgets."""
         dialog.title("Create New Site")
         dialog.geometry("500x300")
         
         # Site name
         ttk.Label(dialog, text="Site Name:").pack(pady=5)
-        name_entry = ttk.Entry(dialog, width=50)
-        name_entry.pack(pady=5)
+        self.create_name_entry = ttk.Entry(dialog, width=50)
+        self.create_name_entry.pack(pady=5)
         
         # Content directory
         ttk.Label(dialog, text="Content Directory:").pack(pady=5)
@@ -238,46 +496,44 @@ class ZedNetGUI:
         path_frame = ttk.Frame(dialog)
         path_frame.pack(pady=5)
         
-        path_entry = ttk.Entry(path_frame, width=40)
-        path_entry.pack(side=tk.LEFT, padx=5)
+        self.create_path_entry = ttk.Entry(path_frame, width=40)
+        self.create_path_entry.pack(side=tk.LEFT, padx=5)
         
         def browse():
-            folder = filedialog.askdirectory()
+            folder = filedialog.askdirectory(parent=dialog)
             if folder:
-                path_entry.delete(0, tk.END)
-                path_entry.insert(0, folder)
+                self.create_path_entry.delete(0, tk.END)
+                self.create_path_entry.insert(0, folder)
         
         ttk.Button(path_frame, text="Browse", command=browse).pack(side=tk.LEFT)
         
         # Password
         ttk.Label(dialog, text="Password (optional):").pack(pady=5)
-        password_entry = ttk.Entry(dialog, width=50, show="*")
-        password_entry.pack(pady=5)
+        self.create_password_entry = ttk.Entry(dialog, width=50, show="*")
+        self.create_password_entry.pack(pady=5)
         
         # Create button
         def create():
-            site_name = name_entry.get().strip()
-            content_path = path_entry.get().strip()
-            password = password_entry.get().strip() or None
+            site_name = self.create_name_entry.get().strip()
+            content_path = self.create_path_entry.get().strip()
+            password = self.create_password_entry.get().strip() or None
             
             if not site_name or not content_path:
-                messagebox.showerror("Error", "Please fill all required fields")
+                messagebox.showerror("Error", "Please fill all required fields", parent=dialog)
                 return
 
             create_button.config(state="disabled")
 
             def on_site_created(result):
                 if result:
-                    messagebox.showinfo(
-                        "Success",
-                        f"Site created!\n\nSite ID:\n{result['site_id']}\n\n"
-                        f"Share this ID with others to let them access your site."
+                    self._toast(
+                        f"Site created!\nSite ID: {result['site_id']}\n"
+                        f"Right-click the site to copy its ID and share it.",
+                        ms=6000
                     )
-                    self._update_sites_list()
-                    dialog.destroy()
+                    self.controller.request_state_refresh()
+                    dialog.withdraw()
                 else:
-                    # Re-enable button on failure
-                    create_button.config(state="normal")
                     self._show_status_message("Error: Failed to create site.")
             
             coro = self.controller.create_site(
@@ -285,7 +541,10 @@ class ZedNetGUI:
                 Path(content_path),
                 password
             )
-            self._run_async(coro, on_site_created)
+            # Re-enable whether it succeeded or raised; the dialog is reused
+            self._run_async(coro, on_site_created).add_done_callback(
+                lambda _: create_button.config(state="normal")
+            )
 
         create_button = ttk.Button(dialog, text="Create Site", command=create)
         create_button.pack(pady=20)
@@ -293,47 +552,117 @@ class ZedNetGUI:
     def _on_closing(self):
         """Handle window closing."""
         logger.info("Closing GUI.")
+        logging.getLogger().removeHandler(self.queue_handler)
+        self._executor.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
 
-    def _run_async(self, coro, callback: Optional[Callable] = None):
+        # Let pending GUI coroutines (e.g. a publish awaiting its password) unwind
+        # (skipped if closing from inside a loop callback, e.g. a modal dialog)
+        if not self.loop.is_running():
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    def _pump_loop(self):
         """
-        Run a coroutine on the controller's event loop.
-        An optional callback can be executed with the result in the main thread.
+        Run one iteration of the GUI's asyncio loop from the Tk main loop,
+        so GUI-side coroutines and their callbacks run on the Tk thread.
         """
-        async def coroutine_wrapper():
-            try:
-                result = await coro
-                if callback:
-                    self.root.after(0, callback, result)
-            except Exception as e:
-                logger.error(f"Async operation failed: {e}", exc_info=True)
-                self.root.after(0, lambda e=e: self._show_status_message(f"Error: {e}"))
+        self.loop.call_soon(self.loop.stop)
+        self.loop.run_forever()
+        self.root.after(self._next_pump_delay(), self._pump_loop)
 
-        self.controller.loop.call_soon_threadsafe(
-            asyncio.create_task, coroutine_wrapper()
+    def _next_pump_delay(self) -> int:
+        """
+        Milliseconds until the GUI loop should be stepped again: promptly
+        while controller calls are in flight, slowly when idle.
+        """
+        return PUMP_BUSY_MS if self._inflight else PUMP_IDLE_MS
+
+    def _on_controller(self, coro) -> asyncio.Future:
+        """
+        Schedule a coroutine on the controller's event loop.
+        Returns a future on the GUI loop that can be awaited by GUI coroutines.
+        """
+        future = asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, self.controller.loop),
+            loop=self.loop
         )
+        self._inflight += 1
+
+        def finished(_):
+            self._inflight -= 1
+
+        future.add_done_callback(finished)
+        return future
+
+    def _run_async(self, coro, callback: Optional[Callable] = None) -> asyncio.Future:
+        """
+        Run a coroutine on the controller's event loop.
+        An optional callback is executed with the result on the Tk thread.
+
+        Returns:
+            The GUI-loop future, for callers that need to run cleanup
+            however the coroutine finishes
+        """
+        def on_done(future: asyncio.Future):
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error:
+                logger.error(f"Async operation failed: {error}", exc_info=error)
+                self._show_status_message(f"Error: {error}")
+            elif callback:
+                callback(future.result())
+
+        future = self._on_controller(coro)
+        future.add_done_callback(on_done)
+        return future
 
     def _run_in_thread(self, target_func: Callable, callback: Optional[Callable] = None):
         """
-        Run a synchronous (blocking) function in a separate thread.
+        Run a synchronous (blocking) function on the GUI worker pool.
         An optional callback can be executed with the result in the main thread.
         """
-        def thread_target():
+        def on_done(future):
             try:
-                result = target_func()
-                if callback:
-                    self.root.after(0, callback, result)
+                result = future.result()
             except Exception as e:
                 logger.error(f"Threaded operation failed: {e}", exc_info=True)
-                self.root.after(0, lambda e=e: self._show_status_message(f"Error: {e}"))
+                self._post_completion(self._show_status_message, f"Error: {e}")
+                return
+            if callback:
+                self._post_completion(callback, result)
 
-        threading.Thread(target=thread_target, daemon=True).start()
+        self._executor.submit(target_func).add_done_callback(on_done)
+
+    def _post_completion(self, callback: Callable, result):
+        """Queue a callback for the Tk thread; one idle drain covers all queued results."""
+        with self._completion_lock:
+            first = not self._completions
+            self._completions.append((callback, result))
+        if first:
+            self.root.after_idle(self._drain_completions)
+
+    def _drain_completions(self):
+        """Run queued completion callbacks on the Tk thread."""
+        with self._completion_lock:
+            completions = list(self._completions)
+            self._completions.clear()
+        for callback, result in completions:
+            try:
+                callback(result)
+            except Exception as e:
+                logger.error(f"Completion callback failed: {e}", exc_info=True)
 
     def _add_site_from_entry(self):
         """Add site from entry field."""
         site_id = self.site_id_entry.get().strip()
         if not site_id:
-            messagebox.showerror("Error", "Please enter a Site ID")
+            self._show_status_message("Please enter a Site ID")
             return
         
         self._show_status_message(f"Adding site: {site_id[:16]}...")
@@ -351,67 +680,92 @@ class ZedNetGUI:
         """Open selected site in browser."""
         selection = self.downloads_tree.selection()
         if not selection:
-            messagebox.showwarning("Warning", "Please select a site")
+            self._show_status_message("Please select a site")
             return
         
-        item = self.downloads_tree.item(selection[0])
-        site_id = item['values'][0]
+        site_id = selection[0]
         
-        import webbrowser
         url = f"http://127.0.0.1:9999/site/{site_id}/index.html"
-        webbrowser.open(url)
+        self._run_in_thread(lambda: (self._browser or webbrowser).open(url))
+
+    def _warm_browser(self):
+        """Pre-resolve the browser controller (probes for browser binaries)."""
+        try:
+            self._browser = webbrowser.get()
+        except webbrowser.Error:
+            self._browser = None
     
     def _publish_site(self):
         """Publish selected site."""
         selection = self.sites_tree.selection()
         if not selection:
-            messagebox.showwarning("Warning", "Please select a site")
+            self._show_status_message("Please select a site")
             return
         
-        site_id = selection[0]
+        self.loop.create_task(self._publish_site_async(selection[0]))
 
-        password = self._ask_password()
+    async def _publish_site_async(self, site_id: str):
+        """Ask for the key password, then publish. Runs on the GUI loop."""
+        password = await self._ask_password()
 
         self._show_status_message(f"Publishing site: {site_id[:16]}...")
 
-        def on_site_published(result):
-            if result:
-                self._show_status_message(f"Successfully published site: {site_id[:16]}")
-            else:
-                self._show_status_message(f"Failed to publish site: {site_id[:16]}")
+        try:
+            result = await self._on_controller(self.controller.publish_site(site_id, password))
+        except Exception as e:
+            logger.error(f"Async operation failed: {e}", exc_info=True)
+            self._show_status_message(f"Error: {e}")
+            return
 
-        self._run_async(self.controller.publish_site(site_id, password), on_site_published)
+        if result:
+            self._show_status_message(f"Successfully published site: {site_id[:16]}")
+        else:
+            self._show_status_message(f"Failed to publish site: {site_id[:16]}")
 
-    def _ask_password(self) -> Optional[str]:
-        """Show a dialog to ask for a password."""
-        dialog = tk.Toplevel(self.root)
+    def _ask_password(self) -> asyncio.Future:
+        """
+        Show a dialog to ask for a password.
+        Returns a future on the GUI loop resolved with the password (None if closed).
+        """
+        self._show_dialog('password', self._build_password_dialog)
+
+        # A newer request supersedes one still waiting on the dialog
+        if self._password_future is not None and not self._password_future.done():
+            self._password_future.cancel()
+        self._password_future = self.loop.create_future()
+
+        self._password_entry.delete(0, tk.END)
+        self._password_entry.focus_set()
+
+        return self._password_future
+
+    def _build_password_dialog(self, dialog: tk.Toplevel):
+        """Build the password dialog widgets."""
         dialog.title("Password Required")
         dialog.geometry("300x150")
 
         ttk.Label(dialog, text="Enter private key password (if any):").pack(pady=10)
 
-        password_entry = ttk.Entry(dialog, show="*")
-        password_entry.pack(pady=5)
-        password_entry.focus_set()
+        self._password_entry = ttk.Entry(dialog, show="*")
+        self._password_entry.pack(pady=5)
 
-        password = None
-        def on_ok():
-            nonlocal password
-            password = password_entry.get()
-            dialog.destroy()
+        def close(password: Optional[str]):
+            future = self._password_future
+            if future is not None and not future.done():
+                future.set_result(password)
+            self._password_entry.delete(0, tk.END)
+            dialog.withdraw()
 
-        ttk.Button(dialog, text="OK", command=on_ok).pack(pady=10)
+        ttk.Button(dialog, text="OK", command=lambda: close(self._password_entry.get())).pack(pady=10)
+        dialog.protocol("WM_DELETE_WINDOW", lambda: close(None))
 
         dialog.transient(self.root)
-        dialog.wait_window()
-
-        return password
     
     def _stop_seeding(self):
         """Stop seeding selected site."""
         selection = self.sites_tree.selection()
         if not selection:
-            messagebox.showwarning("Warning", "Please select a site")
+            self._show_status_message("Please select a site")
             return
         
         # TODO: Implement stop seeding
@@ -419,10 +773,21 @@ class ZedNetGUI:
 
     def _show_sites_menu(self, event):
         """Show right-click menu for my sites."""
-        selection = self.sites_tree.identify_row(event.y)
-        if selection:
-            self.sites_tree.selection_set(selection)
-            self.sites_menu.post(event.x_root, event.y_root)
+        row = self.sites_tree.identify_row(event.y)
+        if not row:
+            return
+        if self.sites_tree.selection() != (row,):
+            self.sites_tree.selection_set(row)
+
+        if self.sites_menu is None:
+            self.sites_menu = tk.Menu(self.sites_tree, tearoff=0)
+            self.sites_menu.add_command(label="Publish Site", command=self._publish_site)
+            self.sites_menu.add_command(label="Stop Seeding", command=self._stop_seeding)
+            self.sites_menu.add_separator()
+            self.sites_menu.add_command(label="Copy Site ID", command=self._copy_site_id)
+            self.sites_menu.add_separator()
+            self.sites_menu.add_command(label="Remove Site...", command=self._remove_site)
+        self.sites_menu.post(event.x_root, event.y_root)
 
     def _copy_site_id(self):
         """Copy selected site ID to clipboard."""
@@ -433,32 +798,36 @@ class ZedNetGUI:
         site_id = selection[0]
         self.root.clipboard_clear()
         self.root.clipboard_append(site_id)
-        messagebox.showinfo("Copied", "Site ID copied to clipboard.")
+        self._show_status_message("Site ID copied to clipboard.", 1500)
     
     def _add_site_dialog(self):
         """Show add site dialog."""
-        dialog = tk.Toplevel(self.root)
+        self._show_dialog('add', self._build_add_dialog)
+        self.add_site_id_entry.delete(0, tk.END)
+
+    def _build_add_dialog(self, dialog: tk.Toplevel):
+        """Build the add site dialog widgets."""
         dialog.title("Add Site")
         dialog.geometry("600x150")
         
         ttk.Label(dialog, text="ZedNet Site ID:").pack(pady=10)
         
-        entry = ttk.Entry(dialog, width=70)
-        entry.pack(pady=5)
+        self.add_site_id_entry = ttk.Entry(dialog, width=70)
+        self.add_site_id_entry.pack(pady=5)
         
         def add():
-            site_id = entry.get().strip()
+            site_id = self.add_site_id_entry.get().strip()
             if site_id:
-                messagebox.showinfo("In Progress", f"Adding site: {site_id}...")
+                self._show_status_message(f"Adding site: {site_id[:16]}...")
 
                 def on_site_added(result):
                     if result:
                         logger.info(f"Successfully started download for site: {site_id}")
                     else:
-                        messagebox.showerror("Error", f"Failed to add site: {site_id}")
+                        self._show_status_message(f"Failed to add site: {site_id[:16]}")
 
                 self._run_async(self.controller.add_site(site_id), on_site_added)
-                dialog.destroy()
+                dialog.withdraw()
         
         ttk.Button(dialog, text="Add", command=add).pack(pady=10)
     
@@ -466,7 +835,7 @@ class ZedNetGUI:
         """Remove selected site from my sites."""
         selection = self.sites_tree.selection()
         if not selection:
-            messagebox.showwarning("Warning", "Please select a site to remove.")
+            self._show_status_message("Please select a site to remove.")
             return
 
         site_id = selection[0]
@@ -492,20 +861,19 @@ class ZedNetGUI:
         def on_site_deleted(success):
             if success:
                 self._show_status_message("Site deleted successfully.")
-                self._update_sites_list()  # Refresh the list
+                self.controller.request_state_refresh()  # Refresh the list
             else:
                 self._show_status_message("Error: Failed to delete site.")
 
-        # Run the blocking delete operation in a separate thread
-        self._run_in_thread(
-            lambda: self.controller.delete_my_site(site_id, delete_key),
+        self._run_async(
+            self.controller.delete_my_site(site_id, delete_key),
             on_site_deleted
         )
     
     def _import_site_dialog(self):
         """Show import site dialog."""
         # TODO: Implement
-        messagebox.showinfo("Info", "Not yet implemented")
+        self._show_status_message("Import is not yet implemented")
     
     def _show_about(self):
         """Show about dialog."""
@@ -526,90 +894,214 @@ class ZedNetGUI:
             "By using ZedNet, you agree to use it responsibly."
         )
     
-    def _update_ui(self):
-        """Update UI elements periodically."""
+    def _update_status_bar(self):
+        """Update the VPN/P2P status bar indicators periodically."""
+        # Nothing to show while minimized; <Map> triggers a refresh on restore
+        if not self._is_hidden():
+            self._refresh_status_bar()
+
+        # Schedule next update
+        self.root.after(5000, self._update_status_bar)
+
+    def _refresh_status_bar(self):
+        """Start a VPN check (unless one is in flight) and redraw the status bar."""
         try:
-            # Update status bar indicators
-            vpn_status = self.controller.get_vpn_status()
-            vpn_text = "VPN: Active" if vpn_status['appears_safe'] else "VPN: WARNING"
-            p2p_text = "P2P: Online" if self.controller.is_p2p_online() else "P2P: Offline"
-            
-            # Combine status and update right label
-            self.status_label_right.config(text=f"{vpn_text}  |  {p2p_text}  |  Server: http://127.0.0.1:9999")
-            
-            # Update sites list
-            self._update_sites_list()
-            
-            # Update downloads list
-            self._update_downloads_list()
-            
+            if not self._vpn_check_pending:
+                self._vpn_check_pending = True
+                self._run_in_thread(self._check_vpn_status, self._on_vpn_status)
+            self._render_status_bar()
         except Exception as e:
             logger.error("UI update error: %s", e)
-        
-        # Schedule next update
-        self.root.after(1000, self._update_ui)
-    
-    def _update_sites_list(self):
-        """Update my sites list."""
-        # Preserve selection
-        selected_id = None
-        if self.sites_tree.selection():
-            selected_id = self.sites_tree.selection()[0]
-
-        # Clear existing
-        for item in self.sites_tree.get_children():
-            self.sites_tree.delete(item)
-        
-        # Get sites from controller
-        sites = self.controller.get_my_sites()
-        
-        for site in sites:
-            status = self.controller.get_site_status(site['site_id'])
-            
-            if status:
-                self.sites_tree.insert(
-                    '', 'end',
-                    iid=site['site_id'],  # Use full site_id as item ID
-                    values=(
-                        site['site_name'],
-                        site['site_id'][:16] + '...',
-                        status.get('state', 'Unknown'),
-                        status.get('num_peers', 0),
-                        f"{status.get('upload_rate', 0):.1f} KB/s"
-                    )
-                )
 
-        # Restore selection
-        if selected_id and self.sites_tree.exists(selected_id):
-            self.sites_tree.selection_set(selected_id)
-    
-    def _update_downloads_list(self):
-        """Update downloads list."""
-        # Clear existing
-        for item in self.downloads_tree.get_children():
-            self.downloads_tree.delete(item)
-        
-        # Get downloads from controller
-        downloads = self.controller.get_downloads()
+    def _check_vpn_status(self) -> Optional[dict]:
+        """Fetch VPN status; runs on a worker thread."""
+        try:
+            return self.controller.get_vpn_status()
+        except Exception as e:
+            logger.error("VPN status check failed: %s", e)
+            return None
+
+    def _on_vpn_status(self, vpn_status: Optional[dict]):
+        """Receive a VPN status from the worker thread."""
+        self._vpn_check_pending = False
+        if vpn_status is not None:
+            self._vpn_status = vpn_status
+        self._render_status_bar()
+
+    def _render_status_bar(self):
+        """Stage the right-hand status label from the latest known state."""
+        if self._vpn_status is None:
+            vpn_safe, vpn_text = True, "VPN: Checking..."
+        else:
+            vpn_safe = self._vpn_status['appears_safe']
+            vpn_text = "VPN: Active" if vpn_safe else "VPN: WARNING"
+        p2p_text = "P2P: Online" if self.controller.is_p2p_online() else "P2P: Offline"
         
-        for download in downloads:
-            self.downloads_tree.insert('', 'end', values=(
-                download['site_id'][:16] + '...',
-                f"{download.get('progress', 0):.1f}%",
-                download.get('state', 'Unknown'),
-                f"{download.get('download_rate', 0):.1f} KB/s",
-                f"{download.get('upload_rate', 0):.1f} KB/s",
-                download.get('num_peers', 0)
-            ))
+        # Combine status and stage right label (empty colour = style default)
+        if vpn_safe:
+            vpn_color = ""
+        elif self.current_theme == 'dark':
+            vpn_color = Theme.DARK_WARNING
+        else:
+            vpn_color = Theme.LIGHT_WARNING
+        self._stage(
+            self.status_label_right,
+            f"{vpn_text}  |  {p2p_text}  |  Server: http://127.0.0.1:9999",
+            vpn_color
+        )
     
+    def _drain_state_queue(self):
+        """Collect state events pushed by the controller, keeping the latest per row."""
+        received = False
+        while True:
+            try:
+                event = self.controller.state_queue.get_nowait()
+            except Empty:
+                break
+            received = True
+            self._pending_rows[event['kind']][event['site_id']] = event['status']
+
+        visible = self._visible_kind()
+        if visible and self._pending_rows[visible] and not self._apply_scheduled:
+            self._apply_scheduled = True
+            self.root.after(self.batch_interval_ms, self._apply_pending)
+
+        self._state_poll_ms = self._next_poll_ms(self._state_poll_ms, received)
+        self.root.after(self._state_poll_ms, self._drain_state_queue)
+
+    def _is_hidden(self) -> bool:
+        """True while the main window is minimized or withdrawn."""
+        return self.root.state() in ('iconic', 'withdrawn')
+
+    def _on_map(self, event):
+        """Window restored: catch up on everything skipped while it was hidden."""
+        if event.widget is self.root:
+            self._on_tab_changed()
+            self._refresh_status_bar()
+
+    def _visible_kind(self) -> Optional[str]:
+        """Which table is on the selected tab: 'site', 'download' or None."""
+        if self._is_hidden():
+            return None
+        selected = self.notebook.select()
+        if selected == str(self.sites_frame):
+            return 'site'
+        if selected == str(self.downloads_frame):
+            return 'download'
+        return None
+
+    def _apply_pending(self):
+        """Apply coalesced state updates to the table on the visible tab."""
+        self._apply_scheduled = False
+        kind = self._visible_kind()
+        if kind is None:
+            return
+
+        pending, self._pending_rows[kind] = self._pending_rows[kind], {}
+        if kind == 'site':
+            table, make_row = self.sites_table, self._site_row
+        else:
+            table, make_row = self.downloads_table, self._download_row
+
+        try:
+            table.update({
+                site_id: make_row(site_id, status) if status is not None else None
+                for site_id, status in pending.items()
+            })
+        except Exception as e:
+            logger.error("UI update error: %s", e)
+
+    @staticmethod
+    def _site_row(site_id: str, status: dict) -> tuple:
+        """Row values for the my sites table."""
+        return (
+            status['site_name'],
+            _short_id(site_id),
+            status.get('state', 'Unknown'),
+            status.get('num_peers', 0),
+            _fmt_rate(status.get('upload_rate', 0))
+        )
+
+    @staticmethod
+    def _download_row(site_id: str, status: dict) -> tuple:
+        """Row values for the downloads table."""
+        return (
+            _short_id(site_id),
+            _fmt_percent(status.get('progress', 0)),
+            status.get('state', 'Unknown'),
+            _fmt_rate(status.get('download_rate', 0)),
+            _fmt_rate(status.get('upload_rate', 0)),
+            status.get('num_peers', 0)
+        )
+
     def _process_log_queue(self):
-        """Process log queue."""
-        while not self.log_queue.empty():
-            message = self.log_queue.get()
-            self.log_text.insert(tk.END, message + '\n')
-            self.log_text.see(tk.END)
-        self.root.after(100, self._process_log_queue)
+        """Move up to LOG_BATCH_MAX buffered lines into the log viewer."""
+        # While the Logs tab is hidden lines stay in the ring buffer; they are
+        # flushed when the tab is selected (see _on_tab_changed)
+        busy = False
+        if not self._is_hidden() and self.notebook.select() == str(self.log_frame):
+            busy = self._flush_log_buffer(LOG_BATCH_MAX)
+
+        self._log_poll_ms = self._next_poll_ms(self._log_poll_ms, busy)
+        self.root.after(self._log_poll_ms, self._process_log_queue)
+
+    def _flush_log_buffer(self, limit: int) -> bool:
+        """Move up to limit buffered lines into the log viewer. Returns True if any moved."""
+        messages = []
+        dropped = self.queue_handler.dropped - self._log_dropped_seen
+        if dropped:
+            self._log_dropped_seen += dropped
+            messages.append(('WARNING', f"... {dropped} messages dropped ..."))
+
+        popleft = self.log_queue.popleft
+        try:
+            for _ in range(limit):
+                messages.append(popleft())
+        except IndexError:
+            pass
+
+        self._append_log_lines(messages)
+        return bool(messages)
+
+    @staticmethod
+    def _next_poll_ms(current: int, busy: bool) -> int:
+        """Poll faster while there is work, back off exponentially while idle."""
+        if busy:
+            return max(POLL_MIN_MS, current // 2)
+        return min(POLL_MAX_MS, current * 2)
+
+    def _append_log_lines(self, messages):
+        """
+        Append a batch of (levelname, line) pairs to the log viewer.
+        Consecutive lines of the same level share one tagged chunk, and
+        the whole batch goes in with a single insert call.
+        """
+        if messages:
+            chunks = []
+            lines = []
+            level = messages[0][0]
+            for line_level, line in messages:
+                if line_level != level:
+                    chunks.extend(('\n'.join(lines) + '\n', level))
+                    lines = []
+                    level = line_level
+                lines.append(line)
+            chunks.extend(('\n'.join(lines) + '\n', level))
+
+            # Only follow new output if the user hasn't scrolled up
+            at_bottom = self.log_text.yview()[1] >= 0.999
+            self.log_text.configure(state='normal')
+            self.log_text.insert(tk.END, *chunks)
+            self._log_line_count += sum(chunk.count('\n') for chunk in chunks[::2])
+            if self._log_line_count > LOG_MAX_LINES + LOG_TRIM_SLACK:
+                excess = self._log_line_count - LOG_MAX_LINES
+                self.log_text.delete('1.0', f'{excess + 1}.0')
+                self._log_line_count = LOG_MAX_LINES
+            self.log_text.configure(state='disabled')
+            if at_bottom:
+                self.log_text.see(tk.END)
 
     def run(self):
         """Run the GUI."""
+        self._process_log_queue()
         self.root.mainloop()
\ No newline at end of file
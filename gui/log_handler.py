@@ -2,15 +2,34 @@
 Custom logging handler for GUI.
 """
 import logging
-from queue import Queue
+from collections import deque
+
 
 class QueueHandler(logging.Handler):
     """
-    Custom logging handler that puts logs into a queue.
+    Custom logging handler that puts (levelname, formatted line) pairs into
+    a ring buffer. When the buffer is full the oldest lines are discarded
+    and counted.
+
+    Records below level never reach emit (Handler.handle checks it first);
+    records whose logger name doesn't start with name_prefix are skipped
+    before formatting.
     """
-    def __init__(self, log_queue: Queue):
-        super().__init__()
+    def __init__(self, log_queue: deque, level: int = logging.INFO, name_prefix: str = ''):
+        super().__init__(level)
         self.log_queue = log_queue
+        self.name_prefix = name_prefix
+        self.dropped = 0
 
     def emit(self, record):
-        self.log_queue.put(self.format(record))
+        if not record.name.startswith(self.name_prefix):
+            return
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.log_queue) == self.log_queue.maxlen:
+            self.dropped += 1
+        # deque.append is atomic; safe from any logging thread
+        self.log_queue.append((record.levelname, line))
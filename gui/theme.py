@@ -38,6 +38,104 @@ class Theme:
     FONT_SIZE_LARGE = 12
     FONT_SIZE_HEADER = 14
 
+    FONT_NORMAL = (FONT_FAMILY, FONT_SIZE_NORMAL)
+    FONT_BOLD = (FONT_FAMILY, FONT_SIZE_NORMAL, 'bold')
+    FONT_STATUS = (FONT_FAMILY, 9)
+
+    # Per-mode style tables, built once below the class
+    _STYLES = {}
+
+    @staticmethod
+    def _build_styles(bg, surface, text, text_secondary, primary, primary_hover, separator):
+        """
+        Build the style tables for one palette.
+
+        Returns:
+            {'configure': [(style_name, options), ...], 'map': [(style_name, options), ...]}
+        """
+        configure = [
+            # Root style
+            ('.', dict(
+                background=bg,
+                foreground=text,
+                fieldbackground=surface,
+                borderwidth=1,
+                relief=tk.FLAT,
+                font=Theme.FONT_NORMAL
+            )),
+            # Notebook (Tabs)
+            ('TNotebook', dict(background=bg, borderwidth=0)),
+            ('TNotebook.Tab', dict(
+                background=bg,
+                foreground=text_secondary,
+                padding=[8, 4],
+                borderwidth=0,
+                font=Theme.FONT_NORMAL
+            )),
+            # Treeview (Lists)
+            ('Treeview', dict(
+                background=surface,
+                foreground=text,
+                fieldbackground=surface,
+                rowheight=25,
+                borderwidth=0
+            )),
+            ('Treeview.Heading', dict(
+                background=bg,
+                foreground=text,
+                font=Theme.FONT_BOLD,
+                padding=[5, 5]
+            )),
+            # Buttons
+            ('TButton', dict(
+                background=primary,
+                foreground='#FFFFFF',
+                padding=[10, 5],
+                borderwidth=0,
+                font=Theme.FONT_BOLD
+            )),
+            # Frames and Labels
+            ('TFrame', dict(background=bg)),
+            ('TLabel', dict(background=bg, foreground=text)),
+            ('Status.TLabel', dict(font=Theme.FONT_STATUS)),  # For status bar
+            # Entry fields
+            ('TEntry', dict(
+                borderwidth=1,
+                relief=tk.SOLID,
+                bordercolor=separator,
+                padding=5
+            )),
+            # Separators
+            ('TSeparator', dict(background=separator)),
+            # Scrollbars
+            ('TScrollbar', dict(
+                background=surface,
+                troughcolor=bg,
+                relief=tk.FLAT,
+                arrowsize=12
+            )),
+        ]
+
+        mapping = [
+            ('TNotebook.Tab', dict(
+                background=[('selected', surface)],
+                foreground=[('selected', text)]
+            )),
+            ('Treeview.Heading', dict(background=[('active', surface)])),
+            ('Treeview', dict(
+                background=[('selected', primary)],
+                foreground=[('selected', '#FFFFFF')]
+            )),
+            ('TButton', dict(
+                background=[('active', primary_hover), ('disabled', surface)],
+                foreground=[('disabled', text_secondary)]
+            )),
+            ('TEntry', dict(bordercolor=[('focus', primary)])),
+            ('TScrollbar', dict(background=[('active', text_secondary)])),
+        ]
+
+        return {'configure': configure, 'map': mapping}
+
     @staticmethod
     def apply_theme(style, mode='light'):
         """
@@ -47,109 +145,22 @@ class Theme:
             style: The ttk.Style() object.
             mode: 'light' or 'dark'.
         """
-        if mode == 'dark':
-            bg = Theme.DARK_BACKGROUND
-            surface = Theme.DARK_SURFACE
-            text = Theme.DARK_TEXT
-            text_secondary = Theme.DARK_TEXT_SECONDARY
-            primary = Theme.DARK_PRIMARY
-            primary_hover = Theme.DARK_PRIMARY_HOVER
-            separator = Theme.DARK_SEPARATOR
-        else: # Default to light
-            bg = Theme.LIGHT_BACKGROUND
-            surface = Theme.LIGHT_SURFACE
-            text = Theme.LIGHT_TEXT
-            text_secondary = Theme.LIGHT_TEXT_SECONDARY
-            primary = Theme.LIGHT_PRIMARY
-            primary_hover = Theme.LIGHT_PRIMARY_HOVER
-            separator = Theme.LIGHT_SEPARATOR
-
-        # Configure root style
+        styles = Theme._STYLES.get(mode, Theme._STYLES['light'])  # Default to light
+
         style.theme_use('clam')
-        style.configure('.',
-            background=bg,
-            foreground=text,
-            fieldbackground=surface,
-            borderwidth=1,
-            relief=tk.FLAT,
-            font=(Theme.FONT_FAMILY, Theme.FONT_SIZE_NORMAL)
-        )
-
-        # Notebook (Tabs)
-        style.configure('TNotebook', background=bg, borderwidth=0)
-        style.configure('TNotebook.Tab',
-            background=bg,
-            foreground=text_secondary,
-            padding=[8, 4],
-            borderwidth=0,
-            font=(Theme.FONT_FAMILY, Theme.FONT_SIZE_NORMAL)
-        )
-        style.map('TNotebook.Tab',
-            background=[('selected', surface)],
-            foreground=[('selected', text)]
-        )
-
-        # Treeview (Lists)
-        style.configure('Treeview',
-            background=surface,
-            foreground=text,
-            fieldbackground=surface,
-            rowheight=25,
-            borderwidth=0
-        )
-        style.configure('Treeview.Heading',
-            background=bg,
-            foreground=text,
-            font=(Theme.FONT_FAMILY, Theme.FONT_SIZE_NORMAL, 'bold'),
-            padding=[5, 5]
-        )
-        style.map('Treeview.Heading',
-            background=[('active', surface)],
-        )
-        style.map('Treeview',
-            background=[('selected', primary)],
-            foreground=[('selected', '#FFFFFF')]
-        )
-
-        # Buttons
-        style.configure('TButton',
-            background=primary,
-            foreground='#FFFFFF',
-            padding=[10, 5],
-            borderwidth=0,
-            font=(Theme.FONT_FAMILY, Theme.FONT_SIZE_NORMAL, 'bold')
-        )
-        style.map('TButton',
-            background=[('active', primary_hover), ('disabled', surface)],
-            foreground=[('disabled', text_secondary)]
-        )
-
-        # Frames and Labels
-        style.configure('TFrame', background=bg)
-        style.configure('TLabel', background=bg, foreground=text)
-        style.configure('Status.TLabel', font=(Theme.FONT_FAMILY, 9)) # For status bar
-
-        # Entry fields
-        style.configure('TEntry',
-            borderwidth=1,
-            relief=tk.SOLID,
-            bordercolor=separator,
-            padding=5
-        )
-        style.map('TEntry',
-            bordercolor=[('focus', primary)],
-        )
-
-        # Separators
-        style.configure('TSeparator', background=separator)
-
-        # Scrollbars
-        style.configure('TScrollbar',
-            background=surface,
-            troughcolor=bg,
-            relief=tk.FLAT,
-            arrowsize=12
-        )
-        style.map('TScrollbar',
-            background=[('active', text_secondary)]
-        )
+        for name, options in styles['configure']:
+            style.configure(name, **options)
+        for name, options in styles['map']:
+            style.map(name, **options)
+
+
+Theme._STYLES = {
+    'light': Theme._build_styles(
+        Theme.LIGHT_BACKGROUND, Theme.LIGHT_SURFACE, Theme.LIGHT_TEXT, Theme.LIGHT_TEXT_SECONDARY,
+        Theme.LIGHT_PRIMARY, Theme.LIGHT_PRIMARY_HOVER, Theme.LIGHT_SEPARATOR
+    ),
+    'dark': Theme._build_styles(
+        Theme.DARK_BACKGROUND, Theme.DARK_SURFACE, Theme.DARK_TEXT, Theme.DARK_TEXT_SECONDARY,
+        Theme.DARK_PRIMARY, Theme.DARK_PRIMARY_HOVER, Theme.DARK_SEPARATOR
+    ),
+}
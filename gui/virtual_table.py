@@ -0,0 +1,125 @@
+"""
+Windowed Treeview rendering for large site tables.
+"""
+from tkinter import ttk
+from typing import Dict, Optional, Set
+
+
+class VirtualTable:
+    """
+    Renders only the rows of a Treeview that fit in its viewport.
+
+    The full row model (iid -> values, in display order) lives in Python;
+    the tree holds just the visible window, and the scrollbar is driven
+    from the model offset instead of by the tree itself.
+    """
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar, row_height: int = 25):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_height = row_height
+
+        self.rows: Dict[str, tuple] = {}
+        self.rendered: Dict[str, tuple] = {}
+        self.offset = 0
+        self.capacity = 20
+        self.selected: Optional[str] = None
+
+        scrollbar.configure(command=self.yview)
+        tree.bind('<Configure>', self._on_configure, add='+')
+        tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+
+    def update(self, changes: Dict[str, Optional[tuple]]):
+        """Apply row changes (values, or None to remove) and re-render the window."""
+        for iid, values in changes.items():
+            if values is None:
+                self.rows.pop(iid, None)
+            else:
+                self.rows[iid] = values
+        self.render()
+
+    def scroll(self, units: int):
+        """Move the window by a number of rows."""
+        self.offset += units
+        self.render()
+
+    def yview(self, *args):
+        """Scrollbar command: 'moveto FRACTION' or 'scroll N units|pages'."""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.offset = int(round(float(args[1]) * len(self.rows)))
+        elif args[0] == 'scroll':
+            step = self.capacity if args[2] == 'pages' else 1
+            self.offset += int(args[1]) * step
+        self.render()
+
+    def render(self):
+        """Bring the tree in line with the visible slice of the model."""
+        order = list(self.rows)
+        total = len(order)
+        self.offset = max(0, min(self.offset, total - self.capacity))
+        window = order[self.offset:self.offset + self.capacity]
+
+        inserted = self._reconcile({iid: self.rows[iid] for iid in window})
+        if list(self.tree.get_children()) != window:
+            self.tree.set_children('', *window)
+
+        # Rows updated in place keep Tk's own selection; only a row that
+        # scrolled back into view (and so was re-inserted) needs it restored
+        if self.selected in inserted:
+            self.tree.selection_set(self.selected)
+
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(window)) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _reconcile(self, rows: Dict[str, tuple]) -> Set[str]:
+        """
+        Delete removed iids, insert new ones and update only rows whose
+        values changed. rendered is updated in place.
+
+        Returns:
+            The iids that were inserted
+        """
+        inserted = set()
+        # Initial population: keep the widget disabled until every row is in
+        freeze = not self.rendered and len(rows) > 1
+        if freeze:
+            self.tree.state(['disabled'])
+        try:
+            for iid in self.rendered.keys() - rows.keys():
+                self.tree.delete(iid)
+                del self.rendered[iid]
+
+            for iid, values in rows.items():
+                old = self.rendered.get(iid)
+                if old is None:
+                    self.tree.insert('', 'end', iid=iid, values=values)
+                    inserted.add(iid)
+                elif old != values:
+                    self.tree.item(iid, values=values)
+                else:
+                    continue
+                self.rendered[iid] = values
+        finally:
+            if freeze:
+                self.tree.state(['!disabled'])
+                self.tree.update_idletasks()
+        return inserted
+
+    def _on_configure(self, event):
+        """Resize the window to the number of rows that fit (one row for headings)."""
+        capacity = max(1, event.height // self.row_height - 1)
+        if capacity != self.capacity:
+            self.capacity = capacity
+            self.render()
+
+    def _on_select(self, event):
+        """Remember the selection by iid; ignore rows removed by windowing."""
+        selection = self.tree.selection()
+        if selection:
+            self.selected = selection[0]
+        elif self.selected in self.rendered:
+            self.selected = None
@@ -2,24 +2,54 @@
 ZedNet Main Application Entry Point (Updated)
 """
 import sys
+import argparse
+import atexit
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 import threading
 
 # Configure logging
 from config import LOGS_DIR
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s | %(levelname)-8s | %(name)s | %(message)s',
-    handlers=[
-        logging.FileHandler(LOGS_DIR / 'zednet.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
+# Records are queued by the logging thread and written to the file and
+# console by a listener thread, so request/worker threads never block on I/O
+_log_formatter = logging.Formatter('%(asctime)s | %(levelname)-8s | %(name)s | %(message)s')
+_file_handler = logging.handlers.RotatingFileHandler(
+    LOGS_DIR / 'zednet.log',
+    maxBytes=50 * 1024 * 1024,
+    backupCount=5,
+    encoding='utf-8',
+    delay=True
 )
+_stream_handler = logging.StreamHandler(sys.stdout)
+for _handler in (_file_handler, _stream_handler):
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, _file_handler, _stream_handler, respect_handler_level=True
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# The queued record carries just the message; the listener's handlers
+# apply the real format
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 
 logger = logging.getLogger(__name__)
 
+
+def flush_logs():
+    """Write out every queued log record now."""
+    # stop() drains the queue and joins the listener thread
+    _log_listener.stop()
+    _log_listener.start()
+
 def check_legal_acceptance():
     """Ensure user has accepted terms."""
     from config import TERMS_ACCEPTED, BASE_DIR
@@ -48,8 +78,26 @@ def check_legal_acceptance():
         return False
 
 
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="ZedNet - Decentralized Web")
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help="run without the GUI (local web server only)"
+    )
+    parser.add_argument(
+        '--dev',
+        action='store_true',
+        help="serve with the Werkzeug development server instead of waitress"
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Main application entry point."""
+    args = parse_args()
+
     logger.info("="*70)
     logger.info("ZedNet Starting")
     logger.info("="*70)
@@ -107,12 +155,15 @@ def main():
         logger.critical("Stopping all network activity...")
         controller.shutdown()
         logger.critical("Network activity stopped. Restart with VPN to continue.")
+        flush_logs()
     
     # Start kill switch
     if kill_switch_enabled:
         logger.info("Starting VPN kill switch...")
         kill_switch = KillSwitch(check_interval=30, audit_logger=audit_logger)
-        kill_switch.start(emergency_shutdown)
+        # A network change seen by the kill switch also drops the
+        # controller's cached VPN status
+        kill_switch.start(emergency_shutdown, on_status_change=controller.invalidate_vpn_status)
     
     # Initialize and start web server
     logger.info("Starting local web server on %s:%d", LOCAL_HOST, LOCAL_PORT)
@@ -120,7 +171,7 @@ def main():
     
     server_thread = threading.Thread(
         target=run_server,
-        args=(LOCAL_HOST, LOCAL_PORT),
+        args=(LOCAL_HOST, LOCAL_PORT, args.dev),
         daemon=True
     )
     server_thread.start()
@@ -130,17 +181,25 @@ def main():
     logger.info("Local server: http://%s:%d", LOCAL_HOST, LOCAL_PORT)
     logger.info("="*70)
     
-    # Start GUI
-    try:
-        from gui.interface import ZedNetGUI
-        import tkinter
-        
-        logger.info("Starting GUI...")
-        gui = ZedNetGUI(controller)
-        gui.run()
-        
-    except (ImportError, tkinter.TclError) as e:
-        logger.warning("GUI not available or display not found: %s", e)
+    # Start GUI; with --headless tkinter is never imported
+    headless = args.headless
+    if not headless:
+        try:
+            import tkinter
+            from gui.interface import ZedNetGUI
+
+            logger.info("Starting GUI...")
+            gui = ZedNetGUI(controller)
+            gui.run()
+
+        except ImportError as e:
+            logger.warning("GUI not available: %s", e)
+            headless = True
+        except tkinter.TclError as e:
+            logger.warning("GUI not available or display not found: %s", e)
+            headless = True
+
+    if headless:
         logger.info("Running in headless mode. Press Ctrl+C to stop.")
         
         try:
@@ -1,19 +1,35 @@
 """
 Production-hardened local web server.
 """
-from flask import Flask, send_file, abort, render_template, request, flash, redirect, url_for
+from flask import Flask, send_file, abort, render_template, request, flash, redirect, url_for, make_response
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.exceptions import HTTPException
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 import os
+import stat
+import mimetypes
+import asyncio
+import queue
+import atexit
 import threading
 from core.security import SecurityManager
 from core.audit_log import AuditLogger
-from core.storage import SiteStorage
+from core.storage import SiteStorage, loads_json, read_json, write_json_if_changed
 import logging
-from functools import wraps
+from functools import lru_cache, wraps
 import time
 import json
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from flask_compress import Compress
+except ImportError:  # optional response compression
+    Compress = None
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +44,57 @@ app.config['DEBUG'] = False
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024  # 100MB max request
 app.config['SECRET_KEY'] = 'a_secure_random_secret_key_for_flashing' # In a real app, use a proper secret
 
+
+def _make_http_session() -> requests.Session:
+    """
+    Pooled HTTP session for all outbound calls (sites.json fetch, submissions).
+    Idempotent requests are retried twice with backoff; POSTs never are.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': 'ZedNet-LocalServer',
+        'Accept-Encoding': 'gzip, deflate'
+    })
+    return session
+
+
+app.extensions['http'] = _make_http_session()
+
+# Cache lifetime (seconds) for files served from sites
+SITE_FILE_MAX_AGE = 3600
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = SITE_FILE_MAX_AGE
+
+# Behind a reverse proxy that honours X-Sendfile, let it send file bodies
+app.config['USE_X_SENDFILE'] = os.environ.get('ZEDNET_X_SENDFILE', 'false').lower() == 'true'
+
+# Templates ship with the app and never change while it runs: skip the
+# per-render mtime check and compile them once at startup. Compiled
+# bytecode is cached on disk (see initialize_server) so later runs skip the
+# parse/compile step too.
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+app.jinja_env.trim_blocks = True
+app.jinja_env.lstrip_blocks = True
+TEMPLATES = ('layout.html', 'dashboard.html', 'sites.html', 'search.html', 'add_site.html')
+
+# Compress generated pages when flask-compress is installed. Files from
+# sites go out via send_file (direct passthrough) and are never compressed.
+app.config['COMPRESS_MIMETYPES'] = [
+    'text/html', 'text/plain', 'text/css', 'application/json', 'application/javascript'
+]
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_MIN_SIZE'] = 512
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+if Compress is not None:
+    Compress(app)
+
 # Global instances (injected at startup)
 audit_logger: AuditLogger = None
 content_dir: Path = None
@@ -35,6 +102,146 @@ storage: SiteStorage = None
 app_controller = None # Injected AppController instance
 last_sites_json_update_status = "Not yet run."
 
+
+class PublicSitesStore:
+    """
+    In-memory copy of sites.json.
+
+    Requests read from memory; a new list from the central repository is
+    written through to disk. At most every recheck_interval seconds the
+    file's mtime is compared with the loaded copy, so edits made outside
+    the app are picked up too.
+    """
+
+    def __init__(self, sites_file: Path, recheck_interval: float = 5.0):
+        self.sites_file = sites_file
+        self.recheck_interval = recheck_interval
+        self._sites: list = []
+        self._index: List[Tuple[str, dict]] = []
+        self._mtime_ns: Optional[int] = None
+        self._checked_at = float('-inf')
+        self._lock = threading.RLock()
+
+    def _file_mtime_ns(self) -> Optional[int]:
+        """mtime of sites.json, or None if it doesn't exist."""
+        try:
+            return os.stat(self.sites_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self):
+        """(Re)load the list from disk; a missing or unreadable file gives an empty list."""
+        with self._lock:
+            mtime_ns = self._file_mtime_ns()
+            sites = []
+            if mtime_ns is not None:
+                try:
+                    sites = read_json(self.sites_file)
+                except (json.JSONDecodeError, IOError) as e:
+                    logger.error(f"Failed to read or parse sites.json: {e}")
+            self._set_sites(sites)
+            self._mtime_ns = mtime_ns
+            self._checked_at = time.monotonic()
+
+    def get(self) -> list:
+        """Current public sites list. Treat as read-only."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at >= self.recheck_interval:
+                self._checked_at = now
+                if self._file_mtime_ns() != self._mtime_ns:
+                    self.load()
+            return self._sites
+
+    def search(self, query: str) -> list:
+        """Sites whose name contains query (already lowercased)."""
+        self.get()
+        with self._lock:
+            index = self._index
+        return [site for name, site in index if query in name]
+
+    def _set_sites(self, sites: list):
+        """Swap in a new list and its lowercase name index."""
+        self._index = [(site.get('name', '').lower(), site) for site in sites]
+        self._sites = sites
+
+    def replace(self, sites: list):
+        """
+        Write a new list to disk, then serve it from memory. An identical
+        list leaves the file and the served list object untouched.
+        """
+        with self._lock:
+            if not write_json_if_changed(self.sites_file, sites):
+                return
+            self._set_sites(sites)
+            self._mtime_ns = self._file_mtime_ns()
+
+
+public_sites: PublicSitesStore = None
+
+# Audit events are queued by request threads and written by one background
+# thread, so responses never wait on the audit log. The queue is bounded;
+# if the writer falls that far behind, new events are dropped and counted
+# rather than letting memory grow.
+AUDIT_BATCH_MAX = 256
+AUDIT_QUEUE_SIZE = 20000
+audit_queue: "queue.Queue" = None
+audit_dropped = 0
+_audit_thread: threading.Thread = None
+
+
+def _audit(method: str, *args):
+    """Queue a call to audit_logger.<method>(*args) for the background writer."""
+    global audit_dropped
+    # Read once: stop_audit_writer may set the global to None at any time
+    q = audit_queue
+    if q is not None:
+        try:
+            q.put_nowait((method, args))
+        except queue.Full:
+            audit_dropped += 1
+
+
+def _audit_drain(events: "queue.Queue", audit_log: AuditLogger):
+    """Write queued audit events until a None sentinel arrives."""
+    reported = 0
+    while True:
+        batch = [events.get()]
+        try:
+            while len(batch) < AUDIT_BATCH_MAX:
+                batch.append(events.get_nowait())
+        except queue.Empty:
+            pass
+
+        for event in batch:
+            if event is None:
+                return
+            method, args = event
+            try:
+                getattr(audit_log, method)(*args)
+            except Exception as e:
+                logger.error("Failed to write audit event %s: %s", method, e)
+
+        dropped = audit_dropped
+        if dropped != reported:
+            logger.warning("Audit queue full: %d events dropped so far", dropped)
+            reported = dropped
+
+
+def stop_audit_writer(timeout: float = 5.0):
+    """Write out queued audit events and stop the background writer."""
+    global audit_queue
+    if audit_queue is None:
+        return
+    audit_queue.put(None)
+    audit_queue = None
+    if _audit_thread:
+        _audit_thread.join(timeout)
+
+# ETag / Last-Modified of the last sites.json download
+_sites_json_validators: Dict[str, Optional[str]] = {}
+
+
 def fetch_and_update_sites_json():
     """Fetches the sites.json from the central repository and updates the local copy."""
     global last_sites_json_update_status
@@ -43,15 +250,26 @@ def fetch_and_update_sites_json():
         logger.error(last_sites_json_update_status)
         return
 
+    # Revalidate against the last copy; a 304 skips the download and write
+    headers = {}
+    if _sites_json_validators.get('etag'):
+        headers['If-None-Match'] = _sites_json_validators['etag']
+    if _sites_json_validators.get('last_modified'):
+        headers['If-Modified-Since'] = _sites_json_validators['last_modified']
+
     try:
         logger.info("Fetching public sites list from %s", SITES_JSON_URL)
-        response = requests.get(SITES_JSON_URL, timeout=15)
+        response = app.extensions['http'].get(SITES_JSON_URL, headers=headers, timeout=15)
         response.raise_for_status()  # Raises an exception for 4xx or 5xx status codes
 
-        sites_data = response.json()
-        sites_file = storage.data_dir / "sites.json"
-        with open(sites_file, 'w', encoding='utf-8') as f:
-            json.dump(sites_data, f, indent=2)
+        if response.status_code == 304:
+            last_sites_json_update_status = f"Successfully checked at {time.strftime('%Y-%m-%d %H:%M:%S')} (unchanged)"
+            logger.info("sites.json is unchanged")
+            return
+
+        public_sites.replace(loads_json(response.content))
+        _sites_json_validators['etag'] = response.headers.get('ETag')
+        _sites_json_validators['last_modified'] = response.headers.get('Last-Modified')
 
         last_sites_json_update_status = f"Successfully updated at {time.strftime('%Y-%m-%d %H:%M:%S')}"
         logger.info("Successfully updated sites.json")
@@ -67,83 +285,173 @@ def fetch_and_update_sites_json():
         logger.error(last_sites_json_update_status)
 
 
+# Submissions are posted to SUBMIT_SITE_URL by one background worker so the
+# /add-site request doesn't wait on the central API
+SUBMIT_QUEUE_SIZE = 1024
+_submit_queue: "queue.Queue[dict]" = queue.Queue(maxsize=SUBMIT_QUEUE_SIZE)
+last_submission_status = "No submissions yet."
+
+
+def submit_site(payload: dict):
+    """Post one site submission to the central API and record the outcome."""
+    global last_submission_status
+    name = payload['name']
+    try:
+        response = app.extensions['http'].post(SUBMIT_SITE_URL, json=payload, timeout=15)
+        response.raise_for_status() # Check for HTTP errors
+
+        if response.status_code == 201:
+            last_submission_status = f"'{name}' was submitted to the public index."
+        else:
+            last_submission_status = f"'{name}': unexpected status from the API: {response.status_code}"
+    except requests.exceptions.RequestException as e:
+        last_submission_status = f"'{name}': there was an error submitting your site: {e}"
+    logger.info(last_submission_status)
+
+
+def site_submission_worker():
+    """Posts queued site submissions one at a time."""
+    while True:
+        submit_site(_submit_queue.get())
+
+
+SITES_JSON_REFRESH_INTERVAL = 300  # seconds
+
+
 def periodic_sites_json_updater():
     """Runs the updater function in a loop every 5 minutes."""
     while True:
         fetch_and_update_sites_json()
-        time.sleep(300) # 300 seconds = 5 minutes
+        time.sleep(SITES_JSON_REFRESH_INTERVAL)
+
+
+async def periodic_sites_json_update_task():
+    """
+    Same loop as periodic_sites_json_updater, as a task on the controller's
+    event loop. The blocking fetch runs in the loop's default executor.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await loop.run_in_executor(None, fetch_and_update_sites_json)
+        await asyncio.sleep(SITES_JSON_REFRESH_INTERVAL)
 
-# Rate limiting
-request_times = {}
+# Rate limiting: fixed one-minute windows, one counter per (ip, window).
+# Counters are split over RATE_LIMIT_SHARDS dicts by IP, each with its own
+# lock, so requests from different clients rarely wait on each other.
+# Counters for past windows are removed by periodic_rate_limit_sweeper.
 RATE_LIMIT = 100  # requests per minute
+RATE_LIMIT_WINDOW = 60  # seconds
+RATE_LIMIT_SHARDS = 16  # power of two
+_rate_limit_shards: List[Tuple[Dict[Tuple[str, int], int], threading.Lock]] = [
+    ({}, threading.Lock()) for _ in range(RATE_LIMIT_SHARDS)
+]
+
+
+def _admit_request(client_ip: str, now: float) -> bool:
+    """Count a request from client_ip; False if it is over the limit."""
+    key = (client_ip, int(now // RATE_LIMIT_WINDOW))
+    counts, lock = _rate_limit_shards[hash(client_ip) & (RATE_LIMIT_SHARDS - 1)]
+    with lock:
+        count = counts.get(key, 0) + 1
+        counts[key] = count
+    return count <= RATE_LIMIT
+
+
+def _sweep_rate_limits(now: float):
+    """Drop counters of windows that have ended, one shard at a time."""
+    current = int(now // RATE_LIMIT_WINDOW)
+    for counts, lock in _rate_limit_shards:
+        with lock:
+            for key in [key for key in counts if key[1] < current]:
+                del counts[key]
+
+
+def periodic_rate_limit_sweeper():
+    """Runs the rate limit sweep once per window."""
+    while True:
+        time.sleep(RATE_LIMIT_WINDOW)
+        _sweep_rate_limits(time.time())
+
 
 def rate_limit(f):
     """Rate limiting decorator."""
     @wraps(f)
     def decorated_function(*args, **kwargs):
         client_ip = request.remote_addr
-        current_time = time.time()
         
-        # Clean old entries
-        if client_ip in request_times:
-            request_times[client_ip] = [
-                t for t in request_times[client_ip] 
-                if current_time - t < 60
-            ]
-        else:
-            request_times[client_ip] = []
-        
-        # Check limit
-        if len(request_times[client_ip]) >= RATE_LIMIT:
-            if audit_logger:
-                audit_logger.log_security_violation('RATE_LIMIT', {
-                    'ip': client_ip,
-                    'endpoint': request.endpoint
-                })
+        if not _admit_request(client_ip, time.time()):
+            _audit('log_security_violation', 'RATE_LIMIT', {
+                'ip': client_ip,
+                'endpoint': request.endpoint
+            })
             abort(429, "Rate limit exceeded")
         
-        request_times[client_ip].append(current_time)
         return f(*args, **kwargs)
     
     return decorated_function
 
 
+# Rendered dashboard and when it was rendered. The status it shows is
+# polled from the controller, so a few seconds of staleness is fine and
+# saves re-rendering (and re-querying) on every refresh.
+DASHBOARD_CACHE_TTL = 5.0
+_dashboard_cache: Optional[Tuple[float, str]] = None
+
+
 @app.route('/')
 @rate_limit
 def dashboard():
     """Serve the main dashboard."""
+    global _dashboard_cache
     if not app_controller:
         abort(503, "Controller not initialized")
 
-    return render_template(
+    now = time.monotonic()
+    cached = _dashboard_cache
+    if cached is not None and now - cached[0] < DASHBOARD_CACHE_TTL:
+        return cached[1]
+
+    my_sites = app_controller.get_my_sites()
+    html = render_template(
         "dashboard.html",
         p2p_status=app_controller.is_p2p_online(),
         vpn_status=app_controller.get_vpn_status(),
-        my_sites_count=len(app_controller.get_my_sites()),
+        my_sites_count=len(my_sites),
         downloaded_sites_count=len(app_controller.get_downloads()),
-        my_sites=app_controller.get_my_sites(),
+        my_sites=my_sites,
         sites_json_status=last_sites_json_update_status
     )
+    _dashboard_cache = (now, html)
+    return html
+
+# Rendered /sites page for the current public sites list
+SITES_PAGE_MAX_AGE = 60
+_sites_page_cache: Optional[Tuple[list, str]] = None
+
 
 def _get_public_sites():
-    """Helper to load and return the public sites list."""
-    # In a future step, this will fetch from a URL. For now, read from disk.
-    sites_file = storage.data_dir / "sites.json"
-    if not sites_file.exists():
-        return []
-    try:
-        with open(sites_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        logger.error(f"Failed to read or parse sites.json: {e}")
-        return []
+    """Helper to return the public sites list."""
+    return public_sites.get()
 
 @app.route('/sites')
 @rate_limit
 def list_sites():
     """Serve a list of all public sites."""
+    global _sites_page_cache
     sites = _get_public_sites()
-    return render_template("sites.html", sites=sites)
+
+    # The store hands out a new list object whenever sites.json changes,
+    # so the rendered page is reused until then
+    cached = _sites_page_cache
+    if cached is not None and cached[0] is sites:
+        html = cached[1]
+    else:
+        html = render_template("sites.html", sites=sites)
+        _sites_page_cache = (sites, html)
+
+    response = make_response(html)
+    response.cache_control.max_age = SITES_PAGE_MAX_AGE
+    return response
 
 
 @app.route('/search')
@@ -151,13 +459,8 @@ def list_sites():
 def search_sites():
     """Serve the search page and handle search queries."""
     query = request.args.get('q', '').strip().lower()
-    sites = _get_public_sites()
-
     if query:
-        results = [
-            site for site in sites
-            if query in site.get('name', '').lower()
-        ]
+        results = public_sites.search(query)
     else:
         results = [] # Don't show results on initial page load
 
@@ -185,98 +488,255 @@ def add_site():
             flash('Error: SUBMIT_SITE_URL is not configured in the .env file.', 'danger')
             return redirect(url_for('add_site'))
 
+        payload = {
+            "name": site_name,
+            "site_id": site_id,
+            "description": description
+        }
         try:
-            payload = {
-                "name": site_name,
-                "site_id": site_id,
-                "description": description
-            }
-            response = requests.post(SUBMIT_SITE_URL, json=payload, timeout=15)
-            response.raise_for_status() # Check for HTTP errors
-
-            if response.status_code == 201:
-                flash('Your site has been submitted to the public index!', 'success')
-            else:
-                flash(f"Received an unexpected status from the API: {response.status_code}", 'warning')
-
-        except requests.exceptions.RequestException as e:
-            flash(f"There was an error submitting your site: {e}", 'danger')
+            _submit_queue.put_nowait(payload)
+        except queue.Full:
+            flash('Too many submissions are waiting. Please try again later.', 'danger')
+        else:
+            flash('Your site is being submitted to the public index.', 'info')
 
         return redirect(url_for('add_site'))
 
-    return render_template('add_site.html')
+    return render_template('add_site.html', submission_status=last_submission_status)
 
 
-@app.route('/site/<site_id>/<path:filepath>')
-@rate_limit
-def serve_site(site_id: str, filepath: str):
+@lru_cache(maxsize=1024)
+def _resolve_site_dir(site_id: str, version: int) -> Path:
     """
-    Serve file from ZedNet site with maximum security.
-    """
-    client_ip = request.remote_addr
-    
-    # Validate site ID
-    if not SecurityManager.validate_site_id(site_id):
-        if audit_logger:
-            audit_logger.log_security_violation('INVALID_SITE_ID', {
-                'site_id': site_id,
-                'client_ip': client_ip
-            })
-        abort(400, "Invalid site ID format")
+    Base directory to serve a site from.
 
-    # Determine base directory
+    version is storage.version; any metadata change bumps it, so stale
+    entries are simply never looked up again.
+    """
     metadata = storage.load_site_metadata(site_id)
     if metadata and 'content_path' in metadata:
         # It's one of our own sites, serve from original path
-        site_dir = Path(metadata['content_path'])
-    else:
-        # It's a downloaded site
-        site_dir = content_dir / site_id
-    
-    if not site_dir.exists():
-        if audit_logger:
-            audit_logger.log_file_access(site_id, filepath, False, client_ip)
-        abort(404, "Site not found - not downloaded or path is invalid")
-    
+        return Path(metadata['content_path'])
+    # It's a downloaded site
+    return content_dir / site_id
+
+
+# Recently served files, least recently used first:
+# (site_dir, filepath) -> (expires, version, safe_path, mimetype).
+# Only successful lookups are cached, so rejections are always re-checked
+# and audited. Entries live PATH_CACHE_TTL seconds and are ignored once
+# storage.version moves on (a site was published, updated or deleted);
+# nothing else invalidates them. A hit skips sanitize_path but the file is
+# still lstat'ed on every request, so edits, deletions and symlink swaps
+# are seen immediately.
+PATH_CACHE_TTL = 1.0
+PATH_CACHE_SIZE = 8192
+_path_cache: "OrderedDict[Tuple[Path, str], Tuple[float, int, Path, str]]" = OrderedDict()
+_path_cache_lock = threading.Lock()
+
+
+def _cached_file(site_dir: Path, filepath: str, version: int, now: float) -> Optional[Tuple[Path, str]]:
+    """Cached (safe_path, mimetype) for a file looked up less than PATH_CACHE_TTL ago."""
+    key = (site_dir, filepath)
+    with _path_cache_lock:
+        entry = _path_cache.get(key)
+        if entry is None or entry[0] <= now or entry[1] != version:
+            return None
+        _path_cache.move_to_end(key)
+    return entry[2], entry[3]
+
+
+def _cache_file(site_dir: Path, filepath: str, version: int, safe_path: Path,
+                mimetype: str, now: float):
+    """Remember a successful lookup, evicting the least recently used entry past PATH_CACHE_SIZE."""
+    key = (site_dir, filepath)
+    with _path_cache_lock:
+        _path_cache[key] = (now + PATH_CACHE_TTL, version, safe_path, mimetype)
+        _path_cache.move_to_end(key)
+        if len(_path_cache) > PATH_CACHE_SIZE:
+            _path_cache.popitem(last=False)
+
+
+def _regular_file_stat(path: Path) -> Optional[os.stat_result]:
+    """lstat path, or None unless it is (still) a regular file."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+# Blocked paths are audited every time, but the log warning is written at
+# most once per PATH_WARNING_INTERVAL; the ones in between are counted and
+# reported with the next warning, so a scan can't flood the log
+PATH_WARNING_INTERVAL = 60.0
+_path_warning_state = {'next': 0.0, 'suppressed': 0}
+_path_warning_lock = threading.Lock()
+
+
+def _warn_blocked_path(site_id: str, filepath: str, client_ip: str):
+    """Log a blocked path, throttled to one warning per PATH_WARNING_INTERVAL."""
+    now = time.monotonic()
+    with _path_warning_lock:
+        if now < _path_warning_state['next']:
+            _path_warning_state['suppressed'] += 1
+            return
+        suppressed = _path_warning_state['suppressed']
+        _path_warning_state['next'] = now + PATH_WARNING_INTERVAL
+        _path_warning_state['suppressed'] = 0
+    logger.warning(
+        "Path traversal blocked: %s/%s from %s (%d more since last warning)",
+        site_id, filepath, client_ip, suppressed
+    )
+
+
+def _lookup_file(site_id: str, filepath: str, site_dir: Path, client_ip: str) -> Tuple[Path, os.stat_result]:
+    """
+    Sanitize filepath against site_dir and stat it. Aborts the request
+    (after auditing) unless it names a regular file inside the site.
+    """
     # CRITICAL: Sanitize path
     safe_path = SecurityManager.sanitize_path(filepath, site_dir)
     
     if safe_path is None:
-        if audit_logger:
-            audit_logger.log_security_violation('PATH_TRAVERSAL_ATTEMPT', {
-                'site_id': site_id,
-                'filepath': filepath,
-                'client_ip': client_ip
-            })
-        logger.warning("Path traversal blocked: %s/%s from %s", site_id, filepath, client_ip)
+        _audit('log_security_violation', 'PATH_TRAVERSAL_ATTEMPT', {
+            'site_id': site_id,
+            'filepath': filepath,
+            'client_ip': client_ip
+        })
+        _warn_blocked_path(site_id, filepath, client_ip)
         abort(403, "Invalid file path")
     
-    # Check file exists
-    if not safe_path.exists():
-        if audit_logger:
-            audit_logger.log_file_access(site_id, filepath, False, client_ip)
+    # One stat answers exists/is-a-file/mtime; the site directory itself is
+    # only checked when the file is missing, to pick the error message.
+    # safe_path is already resolved, so lstat only differs if the file was
+    # swapped for a symlink since; that is then refused as not a file.
+    try:
+        st = os.lstat(safe_path)
+    except (FileNotFoundError, NotADirectoryError):
+        _audit('log_file_access', site_id, filepath, False, client_ip)
+        try:
+            site_is_dir = stat.S_ISDIR(os.stat(site_dir).st_mode)
+        except OSError:
+            site_is_dir = False
+        if not site_is_dir:
+            abort(404, "Site not found - not downloaded or path is invalid")
         abort(404, "File not found")
     
-    if not safe_path.is_file():
-        if audit_logger:
-            audit_logger.log_security_violation('DIRECTORY_ACCESS_ATTEMPT', {
-                'site_id': site_id,
-                'filepath': filepath,
-                'client_ip': client_ip
-            })
+    if not stat.S_ISREG(st.st_mode):
+        _audit('log_security_violation', 'DIRECTORY_ACCESS_ATTEMPT', {
+            'site_id': site_id,
+            'filepath': filepath,
+            'client_ip': client_ip
+        })
         abort(403, "Not a file")
+
+    return safe_path, st
+
+
+# Text files a publisher may ship precompressed next to the original
+# (index.html.br, app.js.gz); served as-is when the client accepts them
+PRECOMPRESSED_EXTENSIONS = {'.html', '.htm', '.css', '.js', '.json', '.svg', '.txt', '.md', '.xml'}
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _precompressed_variant(safe_path: Path) -> Optional[Tuple[Path, os.stat_result, str]]:
+    """
+    (path, stat, encoding) of a precompressed copy of safe_path the client
+    accepts, or None. lstat so a symlinked variant is never followed out of
+    the site.
+    """
+    accepted = request.accept_encodings
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if encoding not in accepted:
+            continue
+        variant = safe_path.with_name(safe_path.name + suffix)
+        try:
+            st = os.lstat(variant)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            return variant, st, encoding
+    return None
+
+
+@app.route('/site/<site_id>/<path:filepath>')
+@rate_limit
+def serve_site(site_id: str, filepath: str):
+    """
+    Serve file from ZedNet site with maximum security.
+    """
+    client_ip = request.remote_addr
+    
+    # Validate site ID
+    if not SecurityManager.validate_site_id(site_id):
+        _audit('log_security_violation', 'INVALID_SITE_ID', {
+            'site_id': site_id,
+            'client_ip': client_ip
+        })
+        abort(400, "Invalid site ID format")
+
+    version = storage.version
+    site_dir = _resolve_site_dir(site_id, version)
+
+    now = time.monotonic()
+    cached = _cached_file(site_dir, filepath, version, now)
+    st = _regular_file_stat(cached[0]) if cached is not None else None
+    if st is not None:
+        safe_path, mimetype = cached
+    else:
+        # Not cached, or the file has gone or changed type since: the full
+        # lookup decides between serving it, 404 and 403
+        safe_path, st = _lookup_file(site_id, filepath, site_dir, client_ip)
+        # Guessed once per lookup and passed to send_file, which would
+        # otherwise guess it again on every request
+        mimetype = mimetypes.guess_type(safe_path.name)[0] or 'application/octet-stream'
+        _cache_file(site_dir, filepath, version, safe_path, mimetype, now)
     
     # Log successful access
-    if audit_logger:
-        audit_logger.log_file_access(site_id, filepath, True, client_ip)
+    _audit('log_file_access', site_id, filepath, True, client_ip)
     
-    # Serve file
+    compressible = safe_path.suffix.lower() in PRECOMPRESSED_EXTENSIONS
+    variant = _precompressed_variant(safe_path) if compressible else None
+    if variant is not None:
+        send_path, st, encoding = variant
+    else:
+        send_path, encoding = safe_path, None
+
+    # ETag from the stat we already have, instead of Werkzeug's default
+    # that also hashes the path. Kept strong so If-Range still works.
+    etag = f"{st.st_mtime_ns:x}-{st.st_size:x}"
+    if encoding:
+        etag += f"-{encoding}"
+
+    # Serve file; conditional requests get a 304 without the body
     try:
-        return send_file(safe_path)
+        response = send_file(
+            send_path,
+            mimetype=mimetype,
+            conditional=True,
+            etag=etag,
+            last_modified=st.st_mtime,
+            max_age=SITE_FILE_MAX_AGE
+        )
+    except HTTPException:
+        # e.g. 416 for a Range past the end of the file
+        raise
     except Exception as e:
-        logger.error("Error serving %s: %s", safe_path, e)
+        logger.error("Error serving %s: %s", send_path, e)
         abort(500, "Error serving file")
 
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if compressible:
+        response.vary.add('Accept-Encoding')
+
+    # Not immutable: a site ID is its publisher's key, and republishing
+    # changes the files behind the same URLs
+    response.cache_control.public = True
+    response.cache_control.must_revalidate = True
+    return response
+
 
 @app.errorhandler(429)
 def rate_limit_handler(e):
@@ -293,17 +753,76 @@ def internal_error_handler(e):
 
 def initialize_server(controller, audit_log: AuditLogger, content_directory: Path, site_storage: SiteStorage):
     """Initialize server with dependencies."""
-    global app_controller, audit_logger, content_dir, storage
+    global app_controller, audit_logger, content_dir, storage, public_sites, audit_queue, _audit_thread
     app_controller = controller
     audit_logger = audit_log
     content_dir = content_directory
     storage = site_storage
 
-    # Start the background thread for updating sites.json
-    updater_thread = threading.Thread(target=periodic_sites_json_updater, daemon=True)
-    updater_thread.start()
+    if audit_logger:
+        audit_queue = queue.Queue(maxsize=AUDIT_QUEUE_SIZE)
+        _audit_thread = threading.Thread(
+            target=_audit_drain, args=(audit_queue, audit_logger), daemon=True
+        )
+        _audit_thread.start()
+        atexit.register(stop_audit_writer)
+
+    cache_dir = storage.data_dir / "jinja-cache"
+    cache_dir.mkdir(exist_ok=True, mode=0o700)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+    for name in TEMPLATES:
+        app.jinja_env.get_template(name)
+
+    # Serve the local copy until the first fetch completes
+    public_sites = PublicSitesStore(storage.data_dir / "sites.json")
+    public_sites.load()
+
+    # Refresh sites.json on the controller's event loop when there is one,
+    # rather than keeping a thread around that mostly sleeps
+    loop = getattr(controller, 'loop', None)
+    if isinstance(loop, asyncio.AbstractEventLoop):
+        loop.call_soon_threadsafe(asyncio.create_task, periodic_sites_json_update_task())
+    else:
+        updater_thread = threading.Thread(target=periodic_sites_json_updater, daemon=True)
+        updater_thread.start()
+
+    sweeper_thread = threading.Thread(target=periodic_rate_limit_sweeper, daemon=True)
+    sweeper_thread.start()
 
+    submit_thread = threading.Thread(target=site_submission_worker, daemon=True)
+    submit_thread.start()
+
+
+def run_server(host='127.0.0.1', port=9999, dev: bool = False):
+    """
+    Run the server.
+
+    Uses waitress; the Werkzeug development server is only used with
+    dev=True (main.py --dev), when ZEDNET_DEV is set or when waitress is
+    not installed. Setting ZEDNET_PROFILE
+    to a directory writes a cProfile dump of every request there.
+    """
+    profile_dir = os.environ.get('ZEDNET_PROFILE')
+    if profile_dir:
+        from werkzeug.middleware.profiler import ProfilerMiddleware
+        os.makedirs(profile_dir, exist_ok=True)
+        app.wsgi_app = ProfilerMiddleware(app.wsgi_app, stream=None, profile_dir=profile_dir)
+        logger.warning("Profiling every request into %s", profile_dir)
+
+    if not (dev or os.environ.get('ZEDNET_DEV')):
+        try:
+            from waitress import serve
+        except ImportError:
+            logger.warning("waitress not installed; falling back to the development server")
+        else:
+            serve(
+                app,
+                host=host,
+                port=port,
+                threads=int(os.environ.get('ZEDNET_THREADS', 8)),
+                connection_limit=1000,
+                channel_timeout=120
+            )
+            return
 
-def run_server(host='127.0.0.1', port=9999):
-    """Run the server."""
     app.run(host=host, port=port, threaded=True, debug=False)
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""
+Shared test fixtures.
+"""
+import pytest
+from core.security import SecurityManager
+
+
+@pytest.fixture(scope="session")
+def cached_keypair():
+    """One Ed25519 keypair for tests that don't need a fresh one."""
+    return SecurityManager.generate_keypair()
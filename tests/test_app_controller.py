@@ -2,21 +2,20 @@
 Tests for the AppController.
 """
 import pytest
+import asyncio
+import concurrent.futures
+import threading
 from pathlib import Path
-import shutil
 from unittest.mock import MagicMock, patch, AsyncMock
 
 from core.app_controller import AppController
 
 @pytest.fixture
-def test_env():
+def test_env(tmp_path):
     """Set up a test environment."""
-    test_dir = Path("./test_env_controller")
-    if test_dir.exists():
-        shutil.rmtree(test_dir)
+    test_dir = tmp_path / "env"
     test_dir.mkdir()
-    yield test_dir
-    shutil.rmtree(test_dir)
+    return test_dir
 
 def test_app_controller_initialization(test_env):
     """Test that the AppController initializes correctly."""
@@ -99,3 +98,167 @@ async def test_add_site(initialized_controller):
     await initialized_controller.add_site(site_id, auto_update)
 
     mock_downloader.add_site.assert_called_once_with(site_id, auto_update)
+
+def test_collect_state_events_reports_only_changes(initialized_controller):
+    """Test that state events are emitted for new, changed and removed sites only."""
+    site = {'site_id': 'a' * 64, 'site_name': 'Site A', 'status': 'created'}
+    sites = [site]
+
+    with patch.object(initialized_controller, 'get_my_sites', side_effect=lambda: [dict(s) for s in sites]), \
+         patch.object(initialized_controller, 'get_downloads', return_value=[]):
+
+        events = initialized_controller.collect_state_events()
+        assert events == [{
+            'kind': 'site',
+            'site_id': 'a' * 64,
+            'status': {'state': 'created', 'site_id': 'a' * 64, 'site_name': 'Site A'}
+        }]
+
+        # Nothing changed
+        assert initialized_controller.collect_state_events() == []
+
+        site['status'] = 'published'
+        events = initialized_controller.collect_state_events()
+        assert len(events) == 1
+        assert events[0]['status']['state'] == 'published'
+
+        sites.clear()
+        events = initialized_controller.collect_state_events()
+        assert events == [{'kind': 'site', 'site_id': 'a' * 64, 'status': None}]
+
+def test_publish_state_puts_events_on_queue(initialized_controller):
+    """Test that publish_state pushes download deltas onto the state queue."""
+    download = {'site_id': 'b' * 64, 'state': 'downloading', 'progress': 50.0}
+
+    with patch.object(initialized_controller, 'get_my_sites', return_value=[]), \
+         patch.object(initialized_controller, 'get_downloads', return_value=[download]):
+        initialized_controller.publish_state()
+
+    event = initialized_controller.state_queue.get_nowait()
+    assert event == {'kind': 'download', 'site_id': 'b' * 64, 'status': download}
+    assert initialized_controller.state_queue.empty()
+
+@pytest.mark.asyncio
+async def test_delete_my_site(initialized_controller):
+    """Test that delete_my_site deletes site data off the event loop."""
+    with patch.object(initialized_controller.storage, 'delete_site') as mock_delete:
+        result = await initialized_controller.delete_my_site("some_site_id", delete_key=True)
+
+    assert result is True
+    mock_delete.assert_called_once_with("some_site_id", True)
+
+@pytest.mark.asyncio
+async def test_delete_my_site_failure(initialized_controller):
+    """Test that delete_my_site reports storage errors as False."""
+    with patch.object(initialized_controller.storage, 'delete_site', side_effect=OSError("busy")):
+        result = await initialized_controller.delete_my_site("some_site_id")
+
+    assert result is False
+
+def test_vpn_status_is_cached_until_invalidated(test_env):
+    """Test that VPN checks are reused until the cache is invalidated."""
+    controller = AppController(test_env)
+    status = {'appears_safe': True, 'public_ip': '1.2.3.4', 'warning': None}
+
+    with patch('core.app_controller.VPNChecker.check_vpn_status', return_value=status) as mock_check:
+        assert controller.get_vpn_status() == status
+        assert controller.get_vpn_status() == status
+        assert mock_check.call_count == 1
+
+        controller.invalidate_vpn_status()
+        controller.get_vpn_status()
+        assert mock_check.call_count == 2
+
+def test_get_status_map_with_metadata(initialized_controller):
+    """Test that preloaded metadata is used below live seeding state."""
+    seeding_id, idle_id, bare_id = 'c' * 64, 'd' * 64, '1' * 64
+    metadata = {
+        seeding_id: {'site_id': seeding_id, 'site_name': 'Seeding', 'status': 'published'},
+        idle_id: {'site_id': idle_id, 'site_name': 'Idle', 'status': 'created'},
+        bare_id: {'site_id': bare_id, 'site_name': 'No status'},
+    }
+    initialized_controller.publisher.active_sites[seeding_id] = {'torrent': MagicMock(peers=[1, 2])}
+
+    statuses = initialized_controller.get_status_map(list(metadata), metadata)
+
+    assert statuses[seeding_id]['state'] == 'Seeding'
+    assert statuses[seeding_id]['num_peers'] == 2
+    assert statuses[idle_id] == {'state': 'created'}
+    assert statuses[bare_id] == {'state': 'Unknown'}
+
+def test_get_ui_snapshot(initialized_controller):
+    """Test that one snapshot call gathers both tables' rows."""
+    site = {'site_id': 'a' * 64, 'site_name': 'Site A', 'status': 'created'}
+    download = {'site_id': 'b' * 64, 'state': 'downloading', 'progress': 10.0}
+
+    with patch.object(initialized_controller, 'get_my_sites', return_value=[site]), \
+         patch.object(initialized_controller, 'get_downloads', return_value=[download]):
+        snapshot = initialized_controller.get_ui_snapshot()
+
+    assert snapshot == {
+        'sites': [{'state': 'created', 'site_id': 'a' * 64, 'site_name': 'Site A'}],
+        'downloads': [download]
+    }
+
+@pytest.mark.asyncio
+async def test_refresh_state_snapshots_in_executor(initialized_controller):
+    """Test that a state refresh publishes deltas from an executor snapshot."""
+    download = {'site_id': 'e' * 64, 'state': 'downloading', 'progress': 10.0}
+
+    with patch.object(initialized_controller, 'get_my_sites', return_value=[]), \
+         patch.object(initialized_controller, 'get_downloads', return_value=[download]):
+        await initialized_controller._refresh_state()
+
+    event = initialized_controller.state_queue.get_nowait()
+    assert event['kind'] == 'download'
+    assert event['status'] == download
+
+def test_shutdown_cancels_pending_tasks(test_env):
+    """Test that shutdown cancels in-flight tasks and stops the loop thread."""
+    controller = AppController(test_env)
+    controller.thread.start()
+
+    async def long_running():
+        await asyncio.sleep(60)
+
+    future = asyncio.run_coroutine_threadsafe(long_running(), controller.loop)
+    controller.shutdown()
+
+    assert future.cancelled()
+    assert not controller.thread.is_alive()
+
+def test_run_async_and_wait_timeout(test_env):
+    """Test that a timed-out call is cancelled on the controller loop."""
+    controller = AppController(test_env)
+    controller.thread.start()
+    cancelled = threading.Event()
+
+    async def long_running():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def quick():
+        return 42
+
+    try:
+        assert controller.run_async_and_wait(quick(), timeout=1) == 42
+        with pytest.raises(concurrent.futures.TimeoutError):
+            controller.run_async_and_wait(long_running(), timeout=0.05)
+        assert cancelled.wait(1)
+    finally:
+        controller.shutdown()
+
+def test_get_status_map(initialized_controller):
+    """Test that get_status_map batches live and stored statuses."""
+    downloading_id, unknown_id = 'f' * 64, '0' * 64
+    initialized_controller.downloader.active_downloads[downloading_id] = {'torrent': MagicMock(progress=42)}
+
+    statuses = initialized_controller.get_status_map([downloading_id, unknown_id])
+
+    assert statuses == {downloading_id: {'state': 'Downloading', 'progress': 42}}
+    assert initialized_controller.get_downloads() == [
+        {'state': 'Downloading', 'progress': 42, 'site_id': downloading_id}
+    ]
@@ -2,8 +2,6 @@
 Tests for the site downloader.
 """
 import asyncio
-from pathlib import Path
-import shutil
 import logging
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
@@ -12,14 +10,11 @@ from core.downloader import SiteDownloader
 from core.storage import SiteStorage
 
 @pytest.fixture
-def test_env():
+def test_env(tmp_path):
     """Set up a test environment."""
-    test_dir = Path("./test_env")
-    if test_dir.exists():
-        shutil.rmtree(test_dir)
-    test_dir.mkdir(exist_ok=True)
-    yield test_dir
-    shutil.rmtree(test_dir)
+    test_dir = tmp_path / "env"
+    test_dir.mkdir()
+    return test_dir
 
 @pytest.mark.asyncio
 async def test_download_site(test_env):
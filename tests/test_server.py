@@ -0,0 +1,486 @@
+"""
+Tests for the local web server.
+"""
+import asyncio
+import json
+import logging
+import os
+import queue
+import pytest
+from unittest.mock import MagicMock
+from server import local_server
+from server.local_server import PublicSitesStore
+from core.storage import SiteStorage
+
+SITE_ID = 'a' * 64
+
+
+def _clear_rate_limits():
+    """Forget every recorded request."""
+    for counts, _ in local_server._rate_limit_shards:
+        counts.clear()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client serving one downloaded site with an index.html."""
+    site_storage = SiteStorage(tmp_path)
+    site_dir = site_storage.content_dir / SITE_ID
+    site_dir.mkdir()
+    (site_dir / "index.html").write_text("<html>Hello</html>")
+
+    monkeypatch.setattr(local_server, 'storage', site_storage)
+    monkeypatch.setattr(local_server, 'content_dir', site_storage.content_dir)
+    monkeypatch.setattr(local_server, 'audit_logger', None)
+    monkeypatch.setattr(local_server, 'audit_queue', None)
+    _clear_rate_limits()
+    local_server._path_cache.clear()
+    return local_server.app.test_client()
+
+
+class TestPublicSitesStore:
+    """Test suite for the in-memory sites.json cache."""
+
+    def test_load_missing_file(self, tmp_path):
+        """Test that a missing sites.json gives an empty list."""
+        store = PublicSitesStore(tmp_path / "sites.json")
+        store.load()
+        assert store.get() == []
+
+    def test_load_reads_once(self, tmp_path):
+        """Test that reads are served from memory after load."""
+        sites_file = tmp_path / "sites.json"
+        sites_file.write_text(json.dumps([{'name': 'Example'}]))
+
+        store = PublicSitesStore(sites_file)
+        store.load()
+        sites_file.unlink()
+
+        assert store.get() == [{'name': 'Example'}]
+
+    def test_external_edit_reloaded(self, tmp_path):
+        """Test that a changed mtime on sites.json triggers a reload."""
+        sites_file = tmp_path / "sites.json"
+        sites_file.write_text(json.dumps([{'name': 'Old'}]))
+        store = PublicSitesStore(sites_file, recheck_interval=0)
+        store.load()
+
+        sites_file.write_text(json.dumps([{'name': 'Edited'}]))
+        os.utime(sites_file, ns=(0, store._mtime_ns + 1))
+
+        assert store.get() == [{'name': 'Edited'}]
+
+    def test_search_matches_lowercase_names(self, tmp_path):
+        """Test that search matches name substrings case-insensitively."""
+        store = PublicSitesStore(tmp_path / "sites.json")
+        store.replace([{'name': 'ZedNet Wiki'}, {'name': 'Blog'}, {'description': 'no name'}])
+
+        assert store.search('wiki') == [{'name': 'ZedNet Wiki'}]
+        assert store.search('zzz') == []
+
+    def test_replace_writes_through(self, tmp_path):
+        """Test that a new list is written to disk and served from memory."""
+        sites_file = tmp_path / "sites.json"
+        store = PublicSitesStore(sites_file)
+
+        store.replace([{'name': 'New'}])
+
+        assert store.get() == [{'name': 'New'}]
+        assert json.loads(sites_file.read_text()) == [{'name': 'New'}]
+
+    def test_replace_unchanged_is_noop(self, tmp_path):
+        """Test that replacing with identical content neither writes nor swaps the list."""
+        sites_file = tmp_path / "sites.json"
+        store = PublicSitesStore(sites_file)
+        store.replace([{'name': 'Same'}])
+        served = store.get()
+        mtime = sites_file.stat().st_mtime_ns
+        os.utime(sites_file, ns=(0, mtime - 10**9))
+
+        store.replace([{'name': 'Same'}])
+
+        assert store.get() is served
+        assert sites_file.stat().st_mtime_ns == mtime - 10**9
+
+    def test_replace_is_atomic(self, tmp_path):
+        """Test that a shorter list fully replaces the old file and leaves no temp files."""
+        sites_file = tmp_path / "sites.json"
+        store = PublicSitesStore(sites_file)
+
+        store.replace([{'name': 'A much longer site name than the next one'}] * 10)
+        store.replace([])
+
+        assert json.loads(sites_file.read_text()) == []
+        assert list(tmp_path.iterdir()) == [sites_file]
+
+
+def test_templates_compile():
+    """Test that every preloaded template exists and compiles."""
+    for name in local_server.TEMPLATES:
+        assert local_server.app.jinja_env.get_template(name) is not None
+
+
+def test_sites_page_cached_until_list_changes(client, tmp_path, monkeypatch):
+    """Test that /sites is rendered once per public sites list."""
+    store = PublicSitesStore(tmp_path / "sites.json")
+    store.replace([{'name': 'First', 'site_id': SITE_ID}])
+    monkeypatch.setattr(local_server, 'public_sites', store)
+    monkeypatch.setattr(local_server, '_sites_page_cache', None)
+    render = MagicMock(side_effect=lambda name, sites: ','.join(site['name'] for site in sites))
+    monkeypatch.setattr(local_server, 'render_template', render)
+
+    response = client.get('/sites')
+    assert response.data == b'First'
+    assert response.cache_control.max_age == local_server.SITES_PAGE_MAX_AGE
+    client.get('/sites')
+    assert render.call_count == 1
+
+    store.replace([{'name': 'Second', 'site_id': SITE_ID}])
+    assert client.get('/sites').data == b'Second'
+    assert render.call_count == 2
+
+
+def test_dashboard_cached_briefly(client, monkeypatch):
+    """Test that the dashboard is re-rendered only after DASHBOARD_CACHE_TTL."""
+    controller = MagicMock()
+    controller.get_my_sites.return_value = []
+    controller.get_downloads.return_value = []
+    monkeypatch.setattr(local_server, 'app_controller', controller)
+    monkeypatch.setattr(local_server, '_dashboard_cache', None)
+    render = MagicMock(return_value='dashboard')
+    monkeypatch.setattr(local_server, 'render_template', render)
+
+    assert client.get('/').data == b'dashboard'
+    client.get('/')
+    assert render.call_count == 1
+
+    monkeypatch.setattr(local_server, 'DASHBOARD_CACHE_TTL', 0)
+    client.get('/')
+    assert render.call_count == 2
+
+
+class TestRateLimit:
+    """Test suite for the per-IP request limiter."""
+
+    @pytest.fixture(autouse=True)
+    def clean_state(self):
+        """Start each test with no recorded clients."""
+        _clear_rate_limits()
+        yield
+        _clear_rate_limits()
+
+    def test_limit_within_window(self):
+        """Test that requests beyond RATE_LIMIT in one window are refused."""
+        for i in range(local_server.RATE_LIMIT):
+            assert local_server._admit_request('10.0.0.1', 1020.0 + i * 0.01)
+        assert not local_server._admit_request('10.0.0.1', 1021.0)
+
+        # Other clients are unaffected
+        assert local_server._admit_request('10.0.0.2', 1021.0)
+
+    def test_next_window_resets(self):
+        """Test that the count starts again in the next window."""
+        for i in range(local_server.RATE_LIMIT + 1):
+            local_server._admit_request('10.0.0.1', 1020.0)
+
+        assert local_server._admit_request('10.0.0.1', 1020.0 + local_server.RATE_LIMIT_WINDOW)
+
+    def test_sweep_drops_past_windows(self):
+        """Test that the sweep keeps only counters of the current window."""
+        local_server._admit_request('10.0.0.1', 1020.0)
+        local_server._admit_request('10.0.0.2', 1090.0)
+
+        local_server._sweep_rate_limits(1090.0)
+
+        remaining = [key for counts, _ in local_server._rate_limit_shards for key in counts]
+        assert remaining == [('10.0.0.2', 18)]
+
+class TestServeSite:
+    """Test suite for serving site files."""
+
+    def test_serves_file(self, client):
+        """Test that a file is served with caching headers."""
+        response = client.get(f'/site/{SITE_ID}/index.html')
+        assert response.status_code == 200
+        assert response.data == b"<html>Hello</html>"
+        assert response.headers['ETag']
+        assert response.cache_control.max_age == 3600
+        assert response.cache_control.public
+        assert response.cache_control.must_revalidate
+        assert response.headers['Accept-Ranges'] == 'bytes'
+        response.close()
+
+    def test_etag_from_stat(self, client):
+        """Test that the ETag is built from the file's mtime and size."""
+        st = os.stat(local_server.content_dir / SITE_ID / "index.html")
+        response = client.get(f'/site/{SITE_ID}/index.html')
+        assert response.get_etag() == (f"{st.st_mtime_ns:x}-{st.st_size:x}", False)
+        response.close()
+
+    def test_serves_precompressed_variant(self, client):
+        """Test that a shipped .gz copy is served to clients that accept gzip."""
+        site_dir = local_server.content_dir / SITE_ID
+        (site_dir / "index.html.gz").write_bytes(b"gzipped")
+
+        response = client.get(f'/site/{SITE_ID}/index.html', headers={'Accept-Encoding': 'gzip'})
+        assert response.data == b"gzipped"
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.mimetype == 'text/html'
+        assert 'Accept-Encoding' in response.vary
+        assert response.get_etag()[0].endswith('-gzip')
+        response.close()
+
+        response = client.get(f'/site/{SITE_ID}/index.html')
+        assert response.data == b"<html>Hello</html>"
+        assert 'Content-Encoding' not in response.headers
+        response.close()
+
+    def test_range_request(self, client):
+        """Test that a byte range gets a 206 with just that slice."""
+        response = client.get(f'/site/{SITE_ID}/index.html', headers={'Range': 'bytes=6-10'})
+        assert response.status_code == 206
+        assert response.data == b"Hello"
+        assert response.headers['Content-Range'] == 'bytes 6-10/18'
+        assert response.headers['Accept-Ranges'] == 'bytes'
+        response.close()
+
+    def test_unsatisfiable_range(self, client):
+        """Test that a range past the end of the file is a 416."""
+        response = client.get(f'/site/{SITE_ID}/index.html', headers={'Range': 'bytes=100-'})
+        assert response.status_code == 416
+        response.close()
+
+    def test_conditional_request(self, client):
+        """Test that a matching ETag gets a 304 with no body."""
+        first = client.get(f'/site/{SITE_ID}/index.html')
+        etag = first.headers['ETag']
+        first.close()
+
+        response = client.get(f'/site/{SITE_ID}/index.html', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_repeat_hits_skip_lookup(self, client, monkeypatch):
+        """Test that a file served moments ago is not sanitized again."""
+        client.get(f'/site/{SITE_ID}/index.html').close()
+
+        sanitize = MagicMock(side_effect=AssertionError("lookup not cached"))
+        monkeypatch.setattr(local_server.SecurityManager, 'sanitize_path', sanitize)
+        response = client.get(f'/site/{SITE_ID}/index.html')
+        assert response.status_code == 200
+        response.close()
+
+    def test_repeat_hits_reuse_mimetype(self, client, monkeypatch):
+        """Test that the mimetype is guessed once per lookup, not per request."""
+        client.get(f'/site/{SITE_ID}/index.html').close()
+
+        guess = MagicMock(side_effect=AssertionError("mimetype not cached"))
+        monkeypatch.setattr(local_server.mimetypes, 'guess_type', guess)
+        response = client.get(f'/site/{SITE_ID}/index.html')
+        assert response.mimetype == 'text/html'
+        response.close()
+
+    def test_cached_file_deleted_is_404(self, client):
+        """Test that a file removed after being cached is a 404, not a 500."""
+        client.get(f'/site/{SITE_ID}/index.html').close()
+        (local_server.content_dir / SITE_ID / "index.html").unlink()
+
+        assert client.get(f'/site/{SITE_ID}/index.html').status_code == 404
+
+    def test_cached_file_swapped_for_symlink_is_refused(self, client, tmp_path):
+        """Test that a cache hit still refuses a file replaced by a symlink."""
+        client.get(f'/site/{SITE_ID}/index.html').close()
+        index = local_server.content_dir / SITE_ID / "index.html"
+        outside = tmp_path / "outside.html"
+        outside.write_text("elsewhere")
+        index.unlink()
+        index.symlink_to(outside)
+
+        assert client.get(f'/site/{SITE_ID}/index.html').status_code == 403
+
+    def test_path_cache_ignores_old_storage_version(self, client):
+        """Test that a metadata write makes cached lookups stale."""
+        client.get(f'/site/{SITE_ID}/index.html').close()
+        site_dir = local_server.content_dir / SITE_ID
+        version = local_server.storage.version
+        now = local_server.time.monotonic()
+        assert local_server._cached_file(site_dir, 'index.html', version, now) is not None
+        assert local_server._cached_file(site_dir, 'index.html', version + 1, now) is None
+
+    def test_symlink_swapped_in_is_refused(self, client, monkeypatch):
+        """Test that a file replaced by a symlink after sanitizing is not served."""
+        site_dir = local_server.content_dir / SITE_ID
+        target = site_dir / "target.html"
+        target.write_text("elsewhere")
+        link = site_dir / "link.html"
+        link.symlink_to(target)
+        # Simulate the race: sanitize_path hands back the link itself
+        monkeypatch.setattr(local_server.SecurityManager, 'sanitize_path', lambda filepath, base: link)
+
+        assert client.get(f'/site/{SITE_ID}/link.html').status_code == 403
+
+    def test_blocked_path_warnings_throttled(self, client, monkeypatch, caplog):
+        """Test that blocked paths log one warning per interval and count the rest."""
+        monkeypatch.setattr(local_server, '_path_warning_state', {'next': 0.0, 'suppressed': 0})
+
+        # Rejected by sanitize_path for different reasons: extension,
+        # unsafe character, '.' component
+        for path in ('secret.exe', 'a%20b.html', '%252e/index.html'):
+            assert client.get(f'/site/{SITE_ID}/{path}').status_code == 403
+        warnings = [r for r in caplog.records if r.levelno >= logging.WARNING]
+        assert len(warnings) == 1
+        assert 'Path traversal blocked' in warnings[0].getMessage()
+
+        local_server._path_warning_state['next'] = 0.0
+        client.get(f'/site/{SITE_ID}/secret.exe')
+        warnings = [r for r in caplog.records if 'Path traversal blocked' in r.getMessage()]
+        assert '(2 more since last warning)' in warnings[-1].getMessage()
+
+    def test_missing_file(self, client):
+        """Test that a missing file is a 404."""
+        assert client.get(f'/site/{SITE_ID}/missing.html').status_code == 404
+
+    def test_missing_site(self, client):
+        """Test that a site that isn't downloaded is a 404."""
+        response = client.get(f'/site/{"b" * 64}/index.html')
+        assert response.status_code == 404
+        assert b"Site not found" in response.data
+
+    def test_site_dir_follows_metadata(self, client, tmp_path):
+        """Test that a changed content_path is picked up after a metadata write."""
+        assert client.get(f'/site/{SITE_ID}/index.html').status_code == 200
+
+        own_dir = tmp_path / 'own'
+        own_dir.mkdir()
+        (own_dir / 'other.html').write_text("<html>Own</html>")
+        local_server.storage.save_site_metadata(SITE_ID, {'content_path': str(own_dir)})
+
+        response = client.get(f'/site/{SITE_ID}/other.html')
+        assert response.data == b"<html>Own</html>"
+        response.close()
+
+    def test_directory_refused(self, client, tmp_path):
+        """Test that a directory path is refused."""
+        (tmp_path / 'sites' / SITE_ID / 'sub').mkdir()
+        assert client.get(f'/site/{SITE_ID}/sub').status_code == 403
+
+
+class TestAuditWriter:
+    """Test suite for the background audit writer."""
+
+    def test_drain_writes_in_order_until_sentinel(self):
+        """Test that queued events are written in order and the sentinel stops the writer."""
+        events = queue.SimpleQueue()
+        audit_log = MagicMock()
+        events.put(('log_file_access', (SITE_ID, 'index.html', True, '127.0.0.1')))
+        events.put(('log_security_violation', ('RATE_LIMIT', {'ip': '127.0.0.1'})))
+        events.put(None)
+
+        local_server._audit_drain(events, audit_log)
+
+        audit_log.log_file_access.assert_called_once_with(SITE_ID, 'index.html', True, '127.0.0.1')
+        audit_log.log_security_violation.assert_called_once_with('RATE_LIMIT', {'ip': '127.0.0.1'})
+
+    def test_request_queues_audit_event(self, client, monkeypatch):
+        """Test that a served file queues a file access event instead of writing it."""
+        events = queue.SimpleQueue()
+        monkeypatch.setattr(local_server, 'audit_queue', events)
+
+        client.get(f'/site/{SITE_ID}/index.html').close()
+
+        assert events.get_nowait() == ('log_file_access', (SITE_ID, 'index.html', True, '127.0.0.1'))
+
+    def test_full_queue_drops_and_counts(self, monkeypatch):
+        """Test that events are dropped and counted instead of blocking when the queue is full."""
+        events = queue.Queue(maxsize=1)
+        monkeypatch.setattr(local_server, 'audit_queue', events)
+        monkeypatch.setattr(local_server, 'audit_dropped', 0)
+
+        local_server._audit('log_file_access', SITE_ID, 'a.html', True, '127.0.0.1')
+        local_server._audit('log_file_access', SITE_ID, 'b.html', True, '127.0.0.1')
+
+        assert events.qsize() == 1
+        assert local_server.audit_dropped == 1
+
+
+class TestSiteSubmission:
+    """Test suite for background site submissions."""
+
+    def test_post_queues_submission(self, client, monkeypatch):
+        """Test that /add-site queues the payload instead of posting it inline."""
+        submissions = queue.Queue()
+        http = MagicMock()
+        monkeypatch.setattr(local_server, '_submit_queue', submissions)
+        monkeypatch.setattr(local_server, 'app_controller', MagicMock())
+        monkeypatch.setattr(local_server, 'SUBMIT_SITE_URL', 'https://example.invalid/submit')
+        monkeypatch.setitem(local_server.app.extensions, 'http', http)
+
+        response = client.post('/add-site', data={
+            'site_name': 'Example', 'site_id': SITE_ID, 'description': 'A site'
+        })
+
+        assert response.status_code == 302
+        assert submissions.get_nowait() == {'name': 'Example', 'site_id': SITE_ID, 'description': 'A site'}
+        http.post.assert_not_called()
+
+    def test_submit_site_records_outcome(self, monkeypatch):
+        """Test that the worker posts the payload and records the result."""
+        http = MagicMock()
+        http.post.return_value.status_code = 201
+        monkeypatch.setattr(local_server, 'SUBMIT_SITE_URL', 'https://example.invalid/submit')
+        monkeypatch.setattr(local_server, 'last_submission_status', '')
+        monkeypatch.setitem(local_server.app.extensions, 'http', http)
+
+        local_server.submit_site({'name': 'Example', 'site_id': SITE_ID, 'description': 'A site'})
+
+        http.post.assert_called_once()
+        assert 'submitted' in local_server.last_submission_status
+
+
+class TestSitesJsonFetch:
+    """Test suite for the periodic sites.json download."""
+
+    @pytest.fixture
+    def fetch_env(self, tmp_path, monkeypatch):
+        """Store, HTTP session and URL for a fetch."""
+        store = PublicSitesStore(tmp_path / "sites.json")
+        http = MagicMock()
+        monkeypatch.setattr(local_server, 'public_sites', store)
+        monkeypatch.setattr(local_server, 'SITES_JSON_URL', 'https://example.invalid/sites.json')
+        monkeypatch.setattr(local_server, '_sites_json_validators', {})
+        monkeypatch.setattr(local_server, 'last_sites_json_update_status', '')
+        monkeypatch.setitem(local_server.app.extensions, 'http', http)
+        return store, http
+
+    def test_revalidates_with_etag(self, fetch_env):
+        """Test that the second fetch sends the ETag and a 304 keeps the list."""
+        store, http = fetch_env
+        http.get.return_value = MagicMock(
+            status_code=200,
+            content=b'[{"name": "Example"}]',
+            headers={'ETag': '"v1"', 'Last-Modified': 'Wed, 14 Oct 2026 10:00:00 GMT'}
+        )
+        local_server.fetch_and_update_sites_json()
+        assert store.get() == [{'name': 'Example'}]
+
+        http.get.return_value = MagicMock(status_code=304, content=b'', headers={})
+        local_server.fetch_and_update_sites_json()
+
+        sent = http.get.call_args.kwargs['headers']
+        assert sent == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 14 Oct 2026 10:00:00 GMT'}
+        assert store.get() == [{'name': 'Example'}]
+        assert 'unchanged' in local_server.last_sites_json_update_status
+
+    def test_update_task_fetches_then_sleeps(self, monkeypatch):
+        """Test that the event loop task fetches off-loop and then waits for the interval."""
+        fetch = MagicMock()
+        monkeypatch.setattr(local_server, 'fetch_and_update_sites_json', fetch)
+        monkeypatch.setattr(local_server, 'SITES_JSON_REFRESH_INTERVAL', 3600)
+
+        async def run_briefly():
+            task = asyncio.create_task(local_server.periodic_sites_json_update_task())
+            await asyncio.sleep(0.1)
+            task.cancel()
+
+        asyncio.run(run_briefly())
+        fetch.assert_called_once_with()
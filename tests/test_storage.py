@@ -0,0 +1,66 @@
+"""
+Tests for site storage and its JSON helpers.
+"""
+import json
+import pytest
+from core import storage
+from core.storage import SiteStorage, atomic_write_json, read_json, write_json_if_changed
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def json_backend(request, monkeypatch):
+    """Run a test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == 'json':
+        monkeypatch.setattr(storage, 'orjson', None)
+    elif storage.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_json_roundtrip(tmp_path, json_backend):
+    """Test that written JSON is indented, stdlib-readable and reads back."""
+    path = tmp_path / "data.json"
+    obj = {'name': 'Site ü', 'files': [1, 2, 3], 'nested': {'ok': True}}
+
+    atomic_write_json(path, obj)
+
+    assert read_json(path) == obj
+    assert json.loads(path.read_text(encoding='utf-8')) == obj
+    assert '\n  "name"' in path.read_text(encoding='utf-8')
+
+
+def test_write_json_if_changed(tmp_path):
+    """Test that identical content is not rewritten."""
+    path = tmp_path / "data.json"
+
+    assert write_json_if_changed(path, {'a': 1})
+    assert not write_json_if_changed(path, {'a': 1})
+    assert write_json_if_changed(path, {'a': 2})
+    assert read_json(path) == {'a': 2}
+
+
+def test_non_str_keys_fall_back(tmp_path):
+    """Test that data orjson rejects is still written via json."""
+    path = tmp_path / "data.json"
+    atomic_write_json(path, {1: 'one'})
+    assert read_json(path) == {'1': 'one'}
+
+
+def test_metadata_roundtrip(tmp_path, json_backend):
+    """Test that saved metadata is listed and loaded back."""
+    site_storage = SiteStorage(tmp_path)
+    site_storage.save_site_metadata('a' * 64, {'site_id': 'a' * 64, 'site_name': 'A'})
+
+    assert site_storage.load_site_metadata('a' * 64)['site_name'] == 'A'
+    assert site_storage.list_sites() == [{'site_id': 'a' * 64, 'site_name': 'A'}]
+
+
+def test_list_sites_skips_other_entries(tmp_path):
+    """Test that only regular .json files in the metadata dir are listed."""
+    site_storage = SiteStorage(tmp_path)
+    site_storage.save_site_metadata('a' * 64, {'site_id': 'a' * 64})
+    (site_storage.metadata_dir / 'notes.txt').write_text('ignored')
+    (site_storage.metadata_dir / 'dir.json').mkdir()
+
+    assert site_storage.list_sites() == [{'site_id': 'a' * 64}]
+    assert site_storage.load_site_metadata('b' * 64) is None
@@ -1,7 +1,7 @@
 """
 Test VPN kill switch functionality.
 """
-import pytest
+import threading
 from unittest.mock import Mock, patch
 from core.vpn_check import VPNChecker
 from core.killswitch import KillSwitch
@@ -29,6 +29,15 @@ class TestVPNDetection:
         
         assert not VPNChecker.is_private_ip('8.8.8.8')
         assert not VPNChecker.is_private_ip('1.1.1.1')
+    
+    def test_private_ip_detection_ipv6_and_garbage(self):
+        """Test IPv6 ranges and that unparseable input is treated as private."""
+        assert VPNChecker.is_private_ip('::1')
+        assert VPNChecker.is_private_ip('fd00::1')
+        assert not VPNChecker.is_private_ip('2606:4700:4700::1111')
+        
+        assert VPNChecker.is_private_ip('not an ip')
+        assert VPNChecker.is_private_ip('10.0.0')
 
 
 class TestKillSwitch:
@@ -51,4 +60,33 @@ class TestKillSwitch:
             'warning': 'VPN disconnected'
         }):
             ks._check_vpn_status()
-            assert shutdown_called['called']
\ No newline at end of file
+            assert shutdown_called['called']
+
+    def test_status_change_callback(self):
+        """Test that on_status_change runs when the public IP changes, not otherwise."""
+        ks = KillSwitch(check_interval=1)
+        ks.is_safe = True
+        ks.last_known_ip = '1.2.3.4'
+        ks.on_status_change = Mock()
+        
+        status = {'appears_safe': True, 'public_ip': '1.2.3.4', 'warning': None}
+        with patch.object(VPNChecker, 'check_vpn_status', return_value=status):
+            ks._check_vpn_status()
+        ks.on_status_change.assert_not_called()
+        
+        status = dict(status, public_ip='5.6.7.8')
+        with patch.object(VPNChecker, 'check_vpn_status', return_value=status):
+            ks._check_vpn_status()
+        ks.on_status_change.assert_called_once()
+
+    def test_stop_wakes_monitor(self):
+        """Test that stop() ends the monitor without waiting out the interval."""
+        ks = KillSwitch(check_interval=3600)
+        checked = threading.Event()
+        
+        with patch.object(KillSwitch, '_check_vpn_status', side_effect=checked.set):
+            ks.start(lambda: None)
+            assert checked.wait(timeout=5)  # first check on start
+            
+            ks.stop()
+            assert not ks.monitor_thread.is_alive()
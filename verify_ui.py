@@ -1,25 +1,34 @@
-from playwright.sync_api import sync_playwright
+import asyncio
+from playwright.async_api import async_playwright
 
-def run_verification():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+BASE_URL = "http://localhost:9999"
 
-        # Dashboard
-        page.goto("http://localhost:9999/")
-        page.screenshot(path="dashboard.png")
+PAGES = [
+    ("/", "dashboard.jpg"),
+    ("/sites", "sites.jpg"),
+    ("/add-site", "add_site.jpg"),
+]
 
-        # Sites list
-        page.goto("http://localhost:9999/sites")
-        page.screenshot(path="sites.png")
 
-        # Add site page
-        page.goto("http://localhost:9999/add-site")
-        page.screenshot(path="add_site.png")
+async def capture(context, path, screenshot):
+    """Load one page and save a screenshot of it."""
+    page = await context.new_page()
+    await page.goto(BASE_URL + path)
+    # Viewport-only JPEG encodes much faster than a full-page PNG and is
+    # plenty for eyeballing the layout
+    await page.screenshot(path=screenshot, type="jpeg", quality=80, full_page=False)
 
 
+async def run_verification():
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        # One context, so the pages share cookies and cache
+        context = await browser.new_context()
 
-        browser.close()
+        # The pages don't depend on each other; load them side by side
+        await asyncio.gather(*(capture(context, path, screenshot) for path, screenshot in PAGES))
+
+        await browser.close()
 
 if __name__ == "__main__":
-    run_verification()
+    asyncio.run(run_verification())